@@ -0,0 +1,155 @@
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+from src.model import Map, Walker, Path, ShortestPathFinder
+
+# map sizes (width, height) of the default run, from the puzzle example up to 2000x2000
+SIZES = [(8, 5), (93, 41), (100, 100), (300, 300), (1000, 1000), (2000, 2000)]
+# the example of the puzzle, used for its size instead of a generated map
+EXAMPLE_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+# engines that are run on every map, dfs is exponential and only run on small maps
+ENGINES = ["bfs", "astar", "bidirectional", "wavefront", "dfs"]
+DFS_MAX_FIELDS = 40
+
+
+def generate_map(width, height):
+    # Generate a map string of the given size: a ramp from a (left) to z (right), crossed by
+    # walls every 8 columns that have to be passed through a gap alternating at the bottom
+    # and the top, so the path has to wind through the whole map
+    # the ramp needs at least 26 columns to be climbable, the example is used for its own size
+    if (width, height) == (8, 5):
+        return EXAMPLE_MAP
+    if width < 26:
+        raise Exception("Generated maps need a width of at least 26!")
+    rows = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            elevation = x * 25 // (width - 1)
+            wall = x % 8 == 7 and x < width - 1
+            gap_at_bottom = (x // 8) % 2 == 0
+            if wall and y != (height - 1 if gap_at_bottom else 0):
+                elevation = 25
+            row.append(chr(ord('a') + elevation))
+        rows.append(row)
+    rows[0][0] = 'S'
+    rows[height - 1][width - 1] = 'E'
+    return "\n".join("".join(row) for row in rows)
+
+
+def measure(function, memory):
+    # Run function once and return its result, the wall time and the peak traced memory
+    # memory tracing slows the run down, so the time is taken from an untraced run
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def neighbours_loop(world):
+    # Visit every field and count its climbable neighbours, like the old solver did per expansion
+    count = 0
+    walker = Walker(world.start)
+    for y in range(world.height):
+        for x in range(world.width):
+            walker.position = world.get_field(x, y)
+            count += walker.count_climbable_neighbors(world.get_neighbours(walker.position))
+    return count
+
+
+def solve(world, engine):
+    # Solve the map from its start with the given engine
+    walker = Walker(world)
+    return ShortestPathFinder.solve(world, Path(walker), walker, engine=engine)
+
+
+def run(sizes=SIZES, engines=ENGINES, memory=True):
+    # Run all benchmarks on generated maps of the given sizes and return the report records
+    records = []
+    for width, height in sizes:
+        map_string = generate_map(width, height)
+
+        def record(name, function, expanded=lambda result: None):
+            result, seconds, peak = measure(function, memory)
+            records.append({
+                "benchmark": name,
+                "width": width,
+                "height": height,
+                "seconds": seconds,
+                "expanded": expanded(result),
+                "peak_bytes": peak,
+            })
+            return result
+
+        world = record("from_string", lambda: Map.from_string(map_string))
+        record("from_string_compact", lambda: Map.from_string(map_string, compact=True))
+        record("get_neighbours", lambda: neighbours_loop(world))
+        record("get_adjacency", lambda: (world.invalidate(), world.get_adjacency()))
+        for engine in engines:
+            if engine == "dfs" and width * height > DFS_MAX_FIELDS:
+                continue
+            record(f"solve_{engine}", lambda: solve(world, engine), lambda result: ShortestPathFinder.stats.expanded)
+        record("distance_field", lambda: ShortestPathFinder.distance_field(world),
+               lambda result: len(result.order))
+    return records
+
+
+def find_regressions(records, baseline, tolerance):
+    # Compare the records with a baseline report and return the records that got slower than
+    # tolerance times the baseline time
+    known = {(entry["benchmark"], entry["width"], entry["height"]): entry for entry in baseline}
+    regressions = []
+    for entry in records:
+        old = known.get((entry["benchmark"], entry["width"], entry["height"]))
+        if old is not None and entry["seconds"] > old["seconds"] * tolerance:
+            regressions.append(entry)
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark parsing, neighbour lookups and the solver engines.")
+    parser.add_argument("--max-size", type=int, default=None,
+                        help="only run maps with at most this many fields")
+    parser.add_argument("--engines", nargs="+", default=ENGINES, help="engines to benchmark")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--output", default=None, help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", default=None, help="JSON report of an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="allowed slow down against the compared report (default 1.5)")
+    options = parser.parse_args(args)
+
+    sizes = [size for size in SIZES if options.max_size is None or size[0] * size[1] <= options.max_size]
+    records = run(sizes, options.engines, memory=not options.no_memory)
+    report = json.dumps(records, indent=2)
+    if options.output is None:
+        print(report)
+    else:
+        with open(options.output, "w") as output:
+            output.write(report + "\n")
+
+    if options.compare is not None:
+        with open(options.compare) as baseline:
+            regressions = find_regressions(records, json.load(baseline), options.tolerance)
+        for entry in regressions:
+            print(f"regression: {entry['benchmark']} {entry['width']}x{entry['height']} "
+                  f"took {entry['seconds']:.4f}s", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import sys
+import mmap
+import time
+import struct
+import argparse
+
+from .model import Map, CompactMap
+
+# header of a binary map file: magic, width, height, start x, start y, end x, end y
+# little endian, a missing start or end is stored as -1, -1
+# the header is followed by width * height elevation bytes, row by row (index y * width + x)
+HEADER = struct.Struct('<4sIIiiii')
+MAGIC = b'HMAP'
+
+
+def is_binary_map(file_name):
+    # Return True if the file starts like a binary map file
+    with open(file_name, 'rb') as map_file:
+        return map_file.read(len(MAGIC)) == MAGIC
+
+
+def load_map(file_name):
+    # Open a map file, binary map files are memory mapped, text map files are parsed
+    if is_binary_map(file_name):
+        return BinaryMap.from_file(file_name)
+    return Map.from_file(file_name)
+
+
+class BinaryMap(CompactMap):
+    # BinaryMap is a CompactMap backed by a memory mapped binary map file, the elevations are not
+    # read or copied when the map is opened, the pages of the file are loaded when they are used.
+    # The mapping is copy on write: add_field changes the map in memory, never the file.
+    def __init__(self, file_name):
+        # Open an existing binary map file
+        with open(file_name, 'rb') as map_file:
+            header = map_file.read(HEADER.size)
+            if len(header) != HEADER.size or header[:4] != MAGIC:
+                raise Exception(f"{file_name} is not a binary map file!")
+            magic, width, height, start_x, start_y, end_x, end_y = HEADER.unpack(header)
+            map_file.seek(0, 2)
+            if map_file.tell() < HEADER.size + width * height:
+                raise Exception(f"Binary map file {file_name} is too short!")
+            mapped = mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_COPY)
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.mapped = mapped
+        self.elevations = memoryview(mapped)[HEADER.size:HEADER.size + width * height]
+        for x, y in ((start_x, start_y), (end_x, end_y)):
+            if (x, y) != (-1, -1) and not self.is_on_map(x, y):
+                self.close()
+                raise Exception(f"Field {(x, y)} is not on the map!")
+        if end_x >= 0:
+            self.set_end(end_x, end_y)
+        if start_x >= 0:
+            self.set_start(start_x, start_y)
+
+    def close(self):
+        # Release the memory mapping, the map can not be used afterwards
+        self.elevations.release()
+        self.mapped.close()
+
+    @staticmethod
+    def from_file(file_name):
+        # Static method to open a binary map file, like Map.from_file for text maps
+        started = time.perf_counter()
+        map_to_return = BinaryMap(file_name)
+        map_to_return.parse_seconds = time.perf_counter() - started
+        return map_to_return
+
+    @staticmethod
+    def write(map: Map, file_name):
+        # Write a map into a binary map file, elevations have to fit in 0..255
+        if isinstance(map, CompactMap):
+            elevations = map.elevations
+        else:
+            try:
+                elevations = bytes(iter(map.get_elevations()))
+            except ValueError:
+                raise Exception("Elevations have to fit in 0..255!")
+        start = (map.start.x, map.start.y) if hasattr(map, "start") else (-1, -1)
+        end = (map.end.x, map.end.y) if hasattr(map, "end") else (-1, -1)
+        with open(file_name, 'wb') as map_file:
+            map_file.write(HEADER.pack(MAGIC, map.width, map.height, *start, *end))
+            map_file.write(elevations)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Convert a text map file into a binary map file.")
+    parser.add_argument("map_file", help="text map file")
+    parser.add_argument("binary_file", help="binary map file to write")
+    options = parser.parse_args(args)
+    BinaryMap.write(Map.from_file(options.map_file), options.binary_file)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
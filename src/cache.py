@@ -0,0 +1,68 @@
+import copy
+from collections import OrderedDict
+
+from .model import Map, Field, Path, DistanceField, ShortestPathFinder
+
+
+class DistanceFieldCache:
+    # DistanceFieldCache keeps the last solved DistanceFields in memory, keyed by the
+    # content hash and the climbing policy of the map and the target field, and evicts the least recently used one
+    # when it is full. Repeated queries to a cached target only follow the successors.
+    def __init__(self, max_size=32):
+        # Initialize an empty cache holding at most max_size distance fields
+        if max_size < 1:
+            raise Exception("Cache size must be at least 1!")
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_distance_field(self, map: Map, target: Field = None) -> DistanceField:
+        # Get the distance field of the map to target (default: end of the map), solving it on a miss
+        if target is None:
+            target = map.end
+        distances = self.get_cached(map, target)
+        if distances is None:
+            distances = ShortestPathFinder.distance_field(map, target)
+            self.add(distances)
+        return distances
+
+    def get_cached(self, map: Map, target: Field) -> DistanceField:
+        # Get the cached distance field of the map to target, None on a miss (nothing is solved)
+        key = (map.get_content_hash(), map.policy, target.x, target.y)
+        distances = self.entries.get(key)
+        if distances is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        if distances.map is not map:
+            # same content but another map object, share the arrays but build fields from the asking map
+            distances = copy.copy(distances)
+            distances.map = map
+            distances.target = target
+        return distances
+
+    def add(self, distances: DistanceField):
+        # Put a solved distance field into the cache, evicting the least recently used one if it is full
+        key = (distances.map.get_content_hash(), distances.policy, distances.target.x, distances.target.y)
+        self.entries[key] = distances
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_path(self, map: Map, start: Field = None, target: Field = None) -> Path:
+        # Get a shortest path from start (default: start of the map) to target (default: end of the map)
+        # None if the target can not be reached
+        if start is None:
+            start = map.start
+        return self.get_distance_field(map, target).get_path(start)
+
+    def clear(self):
+        # Remove all entries and reset the counters
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
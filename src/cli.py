@@ -0,0 +1,82 @@
+import os
+import sys
+import json
+import argparse
+
+from .model import Map
+from .parallel import solve_map, solve_files
+from .binary import load_map
+
+ENGINES = ["bfs", "astar", "bidirectional", "wavefront", "dfs"]
+
+
+def solve_input(name, engine, include_path, include_stats):
+    # Read and solve one map file (text or binary) or stdin for "-", returns the result dict and the map and
+    # shortest path for plotting (None if the map could not be solved)
+    result = {"file": name}
+    try:
+        if name == "-":
+            world = Map.from_string(sys.stdin.read(), compact=True)
+        else:
+            world = load_map(name)
+        solved, shortest = solve_map(world, engine, include_path, include_stats)
+    except Exception as error:
+        result["error"] = str(error)
+        return result, None, None
+    result.update(solved)
+    return result, world, shortest
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Solve map files and write the results as JSON lines.")
+    parser.add_argument("files", nargs="*", default=["-"], help="map files to solve, - or nothing reads stdin")
+    parser.add_argument("--engine", choices=ENGINES, default="bfs", help="solver engine (default bfs)")
+    parser.add_argument("--path", action="store_true", help="include the steps of the path")
+    parser.add_argument("--stats", action="store_true", help="include the search stats")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="solve the files in this many processes, the results come in finishing order")
+    parser.add_argument("--plot", action="store_true", help="plot every solved path with matplotlib")
+    parser.add_argument("--plot-dir", default=None,
+                        help="write a PNG of every solved path into this directory, works without a display")
+    options = parser.parse_args(args)
+
+    plotting = options.plot or options.plot_dir is not None
+    if options.workers is not None and plotting:
+        parser.error("--plot and --plot-dir can not be used with --workers")
+    if plotting:
+        # imported here, so matplotlib is only loaded when a plot is requested
+        from .visu import plot_path
+    if options.plot_dir is not None:
+        os.makedirs(options.plot_dir, exist_ok=True)
+
+    failed = False
+
+    def write(result):
+        nonlocal failed
+        failed = failed or "error" in result
+        print(json.dumps(result), flush=True)
+
+    if options.workers is not None:
+        if "-" in options.files:
+            write(solve_input("-", options.engine, options.path, options.stats)[0])
+        files = [name for name in options.files if name != "-"]
+        for result in solve_files(files, options.workers, engine=options.engine,
+                                  include_path=options.path, include_stats=options.stats):
+            write(result)
+        return 1 if failed else 0
+
+    for name in options.files:
+        result, world, shortest = solve_input(name, options.engine, options.path, options.stats)
+        if plotting and shortest is not None:
+            elevations = world.get_elevation_grid()
+            if options.plot_dir is not None:
+                result["plot"] = os.path.join(options.plot_dir, ("stdin" if name == "-" else os.path.basename(name)) + ".png")
+                plot_path(shortest.fields, world.height, world.width, result["plot"], elevations)
+            if options.plot:
+                plot_path(shortest.fields, world.height, world.width, elevations=elevations)
+        write(result)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
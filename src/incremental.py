@@ -0,0 +1,139 @@
+from heapq import heappush, heappop
+
+from .model import Map, Field, Path, ClimbingPolicy
+
+INFINITY = float('inf')
+
+
+class IncrementalPlanner:
+    # IncrementalPlanner keeps the state of a D* Lite search between calls: g holds the distance
+    # of every touched field to the end, rhs the one-step lookahead of it. After fields of the map
+    # were changed with change_fields only the fields whose distance is affected are expanded again.
+    # Fields are identified by their index y * width + x, untouched fields have g = rhs = infinity.
+    def __init__(self, map: Map, start: Field = None, end: Field = None, rule=None):
+        # Initialize the planner for a search from start (default: start of the map)
+        # to end (default: end of the map), stepping by the ClimbingPolicy or climbing rule
+        # function rule(from_field, to_field) (default: policy of the map)
+        # the policy is checked per step instead of with the move masks of the map, as those would
+        # have to be compiled for the whole map again after every change
+        self.map = map
+        if rule is None:
+            rule = map.policy
+        if isinstance(rule, ClimbingPolicy):
+            policy = rule
+            rule = lambda from_field, to_field: policy.allows(from_field.elevation, to_field.elevation)
+        self.rule = rule
+        self.start = map.get_index(start if start is not None else map.start)
+        self.end = map.get_index(end if end is not None else map.end)
+        self.g = {}
+        self.rhs = {self.end: 0}
+        # offset added to all keys when the start moves, as the heuristic is relative to it
+        self.key_offset = 0
+        self.queue = []
+        self.queued = {}
+        # number of fields expanded by the last call of get_path
+        self.expanded = 0
+        self.push(self.end)
+
+    def estimate(self, index):
+        # Lower bound of the steps between the start and index (manhattan distance)
+        width = self.map.width
+        return abs(index % width - self.start % width) + abs(index // width - self.start // width)
+
+    def get_key(self, index):
+        # Get the priority of a field in the queue, compared as tuple
+        distance = min(self.g.get(index, INFINITY), self.rhs.get(index, INFINITY))
+        return (distance + self.estimate(index) + self.key_offset, distance)
+
+    def push(self, index):
+        # Put a field into the queue, replacing an older entry of it
+        key = self.get_key(index)
+        self.queued[index] = key
+        heappush(self.queue, (key, index))
+
+    def get_top_key(self):
+        # Get the smallest key in the queue, dropping outdated entries
+        while self.queue:
+            key, index = self.queue[0]
+            if self.queued.get(index) == key:
+                return key
+            heappop(self.queue)
+        return (INFINITY, INFINITY)
+
+    def get_moves(self, index, reverse=False):
+        # Get the indices of the fields that can be reached from index in one step,
+        # or with reverse=True the fields from which index can be reached in one step
+        field = self.map.get_field_at(index)
+        moves = []
+        for neigbor in self.map.get_neighbours(field):
+            if not self.map.is_on_map(neigbor.x, neigbor.y):
+                continue
+            if self.rule(neigbor, field) if reverse else self.rule(field, neigbor):
+                moves.append(self.map.get_index(neigbor))
+        return moves
+
+    def update_field(self, index):
+        # Recompute the lookahead of a field and queue it if it became inconsistent
+        if index != self.end:
+            self.rhs[index] = min((self.g.get(move, INFINITY) + 1 for move in self.get_moves(index)), default=INFINITY)
+        self.queued.pop(index, None)
+        if self.g.get(index, INFINITY) != self.rhs.get(index, INFINITY):
+            self.push(index)
+
+    def compute(self):
+        # Expand inconsistent fields until the distance of the start is final
+        self.expanded = 0
+        while (self.get_top_key() < self.get_key(self.start)
+               or self.g.get(self.start, INFINITY) != self.rhs.get(self.start, INFINITY)):
+            if not self.queue:
+                break
+            old_key, index = heappop(self.queue)
+            del self.queued[index]
+            self.expanded += 1
+            new_key = self.get_key(index)
+            if old_key < new_key:
+                self.push(index)
+            elif self.g.get(index, INFINITY) > self.rhs.get(index, INFINITY):
+                self.g[index] = self.rhs[index]
+                for move in self.get_moves(index, reverse=True):
+                    self.update_field(move)
+            else:
+                self.g[index] = INFINITY
+                self.update_field(index)
+                for move in self.get_moves(index, reverse=True):
+                    self.update_field(move)
+
+    def get_path(self) -> Path:
+        # Repair the search and get a shortest path from the start to the end, None if it is unreachable
+        self.compute()
+        if self.g.get(self.start, INFINITY) == INFINITY:
+            return None
+        path = Path()
+        index = self.start
+        path.add_step(self.map.get_field_at(index))
+        while index != self.end:
+            index = min(self.get_moves(index), key=lambda move: self.g.get(move, INFINITY))
+            path.add_step(self.map.get_field_at(index))
+        return path
+
+    def set_start(self, start: Field):
+        # Move the start, the search state stays valid because the end does not change
+        index = self.map.get_index(start)
+        self.key_offset += self.estimate(index)
+        self.start = index
+
+    def change_fields(self, changes):
+        # Apply a batch of (x, y, elevation) changes to the map and mark the fields whose
+        # moves changed: the changed field itself and all its neighbours
+        touched = set()
+        for x, y, elevation in changes:
+            if not self.map.is_on_map(x, y):
+                raise Exception(f"Field {(x, y)} is not on the map!")
+            self.map.add_field(x, y, elevation)
+            field = self.map.get_field(x, y)
+            touched.add(self.map.get_index(field))
+            for neigbor in self.map.get_neighbours(field):
+                if self.map.is_on_map(neigbor.x, neigbor.y):
+                    touched.add(self.map.get_index(neigbor))
+        for index in touched:
+            self.update_field(index)
@@ -1,5 +1,11 @@
 import sys
-import copy
+import time
+import hashlib
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+
+import numpy as np
 
 
 def get_elevation_from_char(elevation_char, coord):
@@ -12,13 +18,122 @@ def get_elevation_from_char(elevation_char, coord):
     else:
         return ord(elevation_char) - ord('a')
 
+# Translation table from map characters to elevations, used by Map.from_file
+# a-z are 0-25, S and E are a and z, every other byte is marked invalid with 255
+INVALID_ELEVATION = 255
+ELEVATION_TABLE = bytes(
+    ord(ch) - ord('a') if ord('a') <= ord(ch) <= ord('z') else
+    0 if ch == 'S' else 25 if ch == 'E' else INVALID_ELEVATION
+    for ch in map(chr, range(256))
+)
+
+def read_map_rows(file_name, markers):
+    # Stream the rows of a map file as bytes of elevations, converted with ELEVATION_TABLE
+    # checks the rows like Map.from_string does and stores the coordinates of the start and
+    # the end in markers['S'] and markers['E']
+    width = None
+    with open(file_name, 'rb') as map_file:
+        for idx_y, line in enumerate(map_file):
+            line = line.rstrip(b'\r\n')
+            if width is None:
+                width = len(line)
+            elif len(line) != width:
+                raise Exception(f"Invalid line length detected at line {idx_y}!")
+            row = line.translate(ELEVATION_TABLE)
+            idx_x = row.find(INVALID_ELEVATION)
+            if idx_x >= 0:
+                raise Exception(f"Invalid cell detected at {(idx_x, idx_y)}!")
+            for marker, name in ((b'S', "starting"), (b'E', "ending")):
+                idx_x = line.find(marker)
+                if idx_x >= 0:
+                    if marker.decode() in markers or line.find(marker, idx_x + 1) >= 0:
+                        raise Exception(f"Multiple {name} points detected!")
+                    markers[marker.decode()] = (idx_x, idx_y)
+            yield row
+
+class ClimbingPolicy:
+    # ClimbingPolicy declares which steps are legal: at most max_climb elevation levels up, at most
+    # max_descent levels down (None: any) and never onto a field with an elevation in one of the
+    # forbidden (lowest, highest) bands. A map compiles its policy once into four boolean masks
+    # (see get_masks), the solvers only look at the masks. Policies are immutable and hashable,
+    # equal policies share the compiled masks of a map.
+    __slots__ = ('max_climb', 'max_descent', 'forbidden')
+
+    def __init__(self, max_climb=1, max_descent=None, forbidden=()):
+        if max_climb < 0 or (max_descent is not None and max_descent < 0):
+            raise Exception("Climb and descent limits must be at least 0!")
+        forbidden = tuple((low, high) for low, high in forbidden)
+        for low, high in forbidden:
+            if low > high:
+                raise Exception(f"Invalid forbidden band {(low, high)}!")
+        object.__setattr__(self, 'max_climb', max_climb)
+        object.__setattr__(self, 'max_descent', max_descent)
+        object.__setattr__(self, 'forbidden', forbidden)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ClimbingPolicy is immutable, can not set {name}!")
+
+    def __reduce__(self):
+        return (ClimbingPolicy, (self.max_climb, self.max_descent, self.forbidden))
+
+    def __repr__(self):
+        return f'ClimbingPolicy(max_climb={self.max_climb}, max_descent={self.max_descent}, forbidden={self.forbidden})'
+
+    def __eq__(self, other):
+        if not isinstance(other, ClimbingPolicy):
+            return NotImplemented
+        return (self.max_climb, self.max_descent, self.forbidden) == (other.max_climb, other.max_descent, other.forbidden)
+
+    def __hash__(self):
+        return hash((self.max_climb, self.max_descent, self.forbidden))
+
+    def allows(self, from_elevation, to_elevation) -> bool:
+        # Return True if a step from from_elevation to to_elevation is legal
+        if to_elevation - from_elevation > self.max_climb:
+            return False
+        if self.max_descent is not None and from_elevation - to_elevation > self.max_descent:
+            return False
+        return not any(low <= to_elevation <= high for low, high in self.forbidden)
+
+    def get_legal(self, source, target):
+        # Vectorised allows for arrays of elevations
+        legal = target - source <= self.max_climb
+        if self.max_descent is not None:
+            legal &= source - target <= self.max_descent
+        for low, high in self.forbidden:
+            legal &= (target < low) | (target > high)
+        return legal
+
+    def get_masks(self, elevations):
+        # Compile the policy for a (height, width) array of elevations into four boolean masks
+        # (north, south, west, east), True where the step from a field to its neighbour in that
+        # direction is on the map and legal
+        north = np.zeros(elevations.shape, dtype=bool)
+        south = np.zeros(elevations.shape, dtype=bool)
+        west = np.zeros(elevations.shape, dtype=bool)
+        east = np.zeros(elevations.shape, dtype=bool)
+        north[1:, :] = self.get_legal(elevations[1:, :], elevations[:-1, :])
+        south[:-1, :] = self.get_legal(elevations[:-1, :], elevations[1:, :])
+        west[:, 1:] = self.get_legal(elevations[:, 1:], elevations[:, :-1])
+        east[:, :-1] = self.get_legal(elevations[:, :-1], elevations[:, 1:])
+        return north, south, west, east
+
+# policy of the puzzle: at most one level up, any level down
+DEFAULT_POLICY = ClimbingPolicy()
+
 class Field:
     # Field class represents a single field on the map
+    # fields are immutable and hashable, so they can be shared and used in sets and as dict keys
+    __slots__ = ('x', 'y', 'elevation')
+
     def __init__(self, x, y, elevation):
         # Initialize the field's position and elevation
-        self.x = x
-        self.y = y
-        self.elevation = elevation
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, 'elevation', elevation)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Field is immutable, can not set {name}!")
 
     def __repr__(self):
         # Return a string representation of the field
@@ -26,8 +141,13 @@ class Field:
 
     def __eq__(self, other):
         # Return True if the fields are equal, False otherwise
+        if not isinstance(other, Field):
+            return NotImplemented
         return self.x == other.x and self.y == other.y and self.elevation == other.elevation
 
+    def __hash__(self):
+        return hash((self.x, self.y, self.elevation))
+
 class Map:
     # Map class represents a 2D map of fields
     def __init__(self):
@@ -35,6 +155,20 @@ class Map:
         self.fields = {}
         self.width = 0
         self.height = 0
+        # climbing policy used by the solvers, see set_policy
+        self.policy = DEFAULT_POLICY
+        # move masks compiled by get_masks, keyed by policy
+        self.masks = {}
+        # adjacency indices built by get_adjacency, keyed by (rule, reverse)
+        self.adjacencies = {}
+        # reachability index built by get_reachability
+        self.reachability = None
+        # hash of the map content built by get_content_hash
+        self.content_hash = None
+        # seconds from_string or from_file needed to create the map
+        self.parse_seconds = 0.0
+        # shared fields for the positions around the map, built by get_outside_field
+        self.outside = {}
 
     def set_start(self, x, y):
         # Set the start field at given x, y coordinates
@@ -51,11 +185,37 @@ class Map:
     def add_field(self, x, y, elevation):
         # Add a new field to the map with given x, y coordinates and elevation
         self.fields[(x,y)] = Field(x, y, elevation)
+        self.invalidate()
+
+    def invalidate(self):
+        # Drop everything that was derived from the content of the map, called whenever it changes
+        self.masks.clear()
+        self.adjacencies.clear()
+        self.reachability = None
+        self.content_hash = None
+
+    def set_policy(self, policy):
+        # Set the climbing policy the solvers use on this map, drops the indices of the old one
+        self.policy = policy
+        self.invalidate()
+
+    def is_on_map(self, x, y):
+        # Return True if the given x, y coordinates lie inside the map
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_outside_field(self, x, y):
+        # Get the field for a position that is not on the map, it has an elevation of sys.maxsize
+        # so it can never be climbed; the fields are shared, so no new one is created per lookup
+        field = self.outside.get((x, y))
+        if field is None:
+            field = Field(x, y, sys.maxsize)
+            self.outside[(x, y)] = field
+        return field
 
     def get_field(self, x, y):
         # Get the field at given x, y coordinates
-        if x >= self.width or x < 0 or y >= self.height or y < 0:
-            return Field(x, y, sys.maxsize)
+        if not self.is_on_map(x, y):
+            return self.get_outside_field(x, y)
         return self.fields[(x,y)]
 
     def get_neighbours(self, field):
@@ -68,18 +228,84 @@ class Map:
                 self.get_field(field.x - 1, field.y + 0),
                 self.get_field(field.x + 1, field.y + 0)
             )
-        
+
+    def get_index(self, field):
+        # Get the index of the given field, as used by the adjacency index (y * width + x)
+        return field.y * self.width + field.x
+
+    def get_field_at(self, index):
+        # Get the field for the given index
+        return self.get_field(index % self.width, index // self.width)
+
+    def get_elevation_grid(self):
+        # Get the elevations of all fields as (height, width) int64 array
+        return np.array(self.get_elevations(), dtype=np.int64).reshape(self.height, self.width)
+
+    def get_masks(self, policy=None):
+        # Get the (north, south, west, east) move masks of the given policy (default: policy of the map)
+        # compiled on first use and again after the map was changed, see ClimbingPolicy.get_masks
+        if policy is None:
+            policy = self.policy
+        masks = self.masks.get(policy)
+        if masks is None or masks[0].shape != (self.height, self.width):
+            masks = policy.get_masks(self.get_elevation_grid())
+            self.masks[policy] = masks
+        return masks
+
+    def get_adjacency(self, rule=None, reverse=False):
+        # Get the adjacency index of the legal moves for the given ClimbingPolicy (default: policy
+        # of the map) or climbing rule function rule(from_field, to_field)
+        # the index is built on first use and rebuilt after the map was changed
+        if rule is None:
+            rule = self.policy
+        key = (rule, reverse)
+        adjacency = self.adjacencies.get(key)
+        if adjacency is None or adjacency.width != self.width or adjacency.height != self.height:
+            adjacency = Adjacency(self, rule, reverse)
+            self.adjacencies[key] = adjacency
+        return adjacency
+
+    def get_reachability(self, build=True):
+        # Get the reachability index of the legal moves, built on first use and rebuilt after the
+        # map was changed; with build=False only an index that is already built is returned, else None
+        reachability = self.reachability
+        if reachability is not None and (reachability.width != self.width or reachability.height != self.height):
+            reachability = None
+        if reachability is None and build:
+            reachability = Reachability(self, self.get_adjacency())
+        self.reachability = reachability
+        return reachability
+
+    def get_elevations(self):
+        # Get the elevations of all fields as array, indexed by y * width + x
+        return array('q', (self.get_field(x, y).elevation for y in range(self.height) for x in range(self.width)))
+
+    def get_content_hash(self):
+        # Get a hash of the size and the elevations of the map, maps with the same content have the same hash
+        if self.content_hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(array('q', (self.width, self.height)).tobytes())
+            digest.update(self.get_elevations().tobytes())
+            self.content_hash = digest.hexdigest()
+        return self.content_hash
 
     @staticmethod
-    def from_string(map_string: str):
+    def from_string(map_string: str, compact: bool = False):
         # Static method to create a Map object from a multiline string
+        # with compact=True the elevations are stored in a CompactMap instead of a dict of fields
+        started = time.perf_counter()
         start = None
         end = None
-        map_to_return = Map()
         lines = map_string.splitlines()
+        if compact:
+            map_to_return = CompactMap(len(lines[0]) if lines else 0, len(lines))
+        else:
+            map_to_return = Map()
         idx_x = -1
         idx_y = -1
         for idx_y, line in enumerate(lines):
+            if compact and len(line) != map_to_return.width:
+                raise Exception(f"Invalid line length detected at line {idx_y}!")
             for idx_x, ch in enumerate(line):
                 #search for start and end. As specified, start has elevation of a and end z
                 if ch == 'S':
@@ -93,7 +319,6 @@ class Map:
                     end = (idx_x, idx_y)
                     ch = 'z'
                 map_to_return.add_field(x=idx_x, y=idx_y, elevation=get_elevation_from_char(ch, (idx_x, idx_y)))
-        print(f"{lines}")
 
         try:
             map_to_return.width = len(lines[0])
@@ -104,27 +329,307 @@ class Map:
             map_to_return.set_end(end[0], end[1])
         if start is not None:
             map_to_return.set_start(start[0], start[1])
+        map_to_return.parse_seconds = time.perf_counter() - started
+
+        return map_to_return
+
+    @staticmethod
+    def from_file(file_name):
+        # Static method to create a CompactMap from a map file
+        # the file is streamed by read_map_rows, so besides the map only one row is held in memory
+        started = time.perf_counter()
+        markers = {}
+        map_to_return = CompactMap()
+        for row in read_map_rows(file_name, markers):
+            map_to_return.width = len(row)
+            map_to_return.elevations += row
+            map_to_return.height += 1
+        if 'E' in markers:
+            map_to_return.set_end(*markers['E'])
+        if 'S' in markers:
+            map_to_return.set_start(*markers['S'])
+        map_to_return.parse_seconds = time.perf_counter() - started
 
         return map_to_return
 
+class CompactMap(Map):
+    # CompactMap stores the elevations of a map in one contiguous byte buffer indexed by y * width + x
+    # Field objects are only created when they are requested, elevations have to fit in 0..255
+    def __init__(self, width=0, height=0):
+        # Initialize a map of the given size with all elevations set to 0
+        super().__init__()
+        self.fields = None
+        self.width = width
+        self.height = height
+        self.elevations = bytearray(width * height)
+
+    def add_field(self, x, y, elevation):
+        # Set the elevation of the field at given x, y coordinates
+        if not self.is_on_map(x, y):
+            raise Exception(f"Field {(x, y)} is not on the map!")
+        self.elevations[y * self.width + x] = elevation
+        self.invalidate()
+
+    def get_field(self, x, y):
+        # Get a new field object for the given x, y coordinates
+        if not self.is_on_map(x, y):
+            return self.get_outside_field(x, y)
+        return Field(x, y, self.elevations[y * self.width + x])
+
+    def get_elevations(self):
+        # Get the elevations of all fields as array, indexed by y * width + x
+        return array('q', iter(self.elevations))
+
+    def get_elevation_grid(self):
+        # Get the elevations of all fields as (height, width) int64 array, read from the buffer without a per field copy
+        grid = np.frombuffer(self.elevations, dtype=np.uint8)
+        return grid.reshape(self.height, self.width).astype(np.int64)
+
+
+class Adjacency:
+    # Adjacency is a compressed (CSR) index of the legal moves on a map
+    # the fields reachable in one step from index i = y * width + x are
+    # neighbours[offsets[i]:offsets[i + 1]], in the order N, S, W, E
+    # with reverse=True it holds the fields from which a step to i is legal
+    # for a ClimbingPolicy the index is built from the move masks of the map, a climbing rule
+    # function is called for every pair of neighbouring fields
+    def __init__(self, map: Map, rule, reverse=False):
+        self.width = map.width
+        self.height = map.height
+        self.offsets = array('l', [0])
+        self.neighbours = array('l')
+        # number of calls of the climbing rule needed to build the index
+        # (for a policy the number of steps tested in the masks)
+        self.rule_calls = 0
+        if isinstance(rule, ClimbingPolicy):
+            self._build_from_masks(map.get_masks(rule), reverse)
+            return
+        for y in range(self.height):
+            for x in range(self.width):
+                field = map.get_field(x, y)
+                for neigbor in map.get_neighbours(field):
+                    if not map.is_on_map(neigbor.x, neigbor.y):
+                        continue
+                    self.rule_calls += 1
+                    if rule(neigbor, field) if reverse else rule(field, neigbor):
+                        self.neighbours.append(neigbor.y * self.width + neigbor.x)
+                self.offsets.append(len(self.neighbours))
+
+    def _build_from_masks(self, masks, reverse):
+        # Build the index from the (north, south, west, east) move masks in one vectorised pass
+        north, south, west, east = masks
+        if reverse:
+            # the step into a field from its north neighbour is a step south of that neighbour, ...
+            north, south, west, east = (np.zeros_like(mask) for mask in masks)
+            north[1:, :] = masks[1][:-1, :]
+            south[:-1, :] = masks[0][1:, :]
+            west[:, 1:] = masks[3][:, :-1]
+            east[:, :-1] = masks[2][:, 1:]
+        width = self.width
+        indices = np.arange(width * self.height)
+        legal = np.stack([north.ravel(), south.ravel(), west.ravel(), east.ravel()], axis=1)
+        targets = np.stack([indices - width, indices + width, indices - 1, indices + 1], axis=1)
+        dtype = np.dtype(f'i{self.offsets.itemsize}')
+        self.offsets.frombytes(np.cumsum(legal.sum(axis=1)).astype(dtype).tobytes())
+        self.neighbours.frombytes(targets[legal].astype(dtype).tobytes())
+        # every pair of neighbouring fields is tested once in each direction
+        self.rule_calls = 2 * (max(width - 1, 0) * self.height + width * max(self.height - 1, 0))
+
+    def get_moves(self, index):
+        # Get the indices of the fields that are one legal step away from index
+        return self.neighbours[self.offsets[index]:self.offsets[index + 1]]
+
+
+class Reachability:
+    # Reachability answers whether one field can be reached from another with little searching
+    # the fields are grouped into strongly connected components (all fields of a component can
+    # reach each other), numbered in the order Tarjan completes them, so a component can only
+    # reach components with a lower number. Every component gets two interval labels of the
+    # condensation DAG (GRAIL): if a component can reach another, its intervals contain the
+    # intervals of the other one. Most unreachable pairs are refuted by the labels alone, the
+    # other queries search the DAG and skip every component whose labels refute the target.
+    # The index needs a few arrays of the size of the map and the DAG, it grows linearly.
+    def __init__(self, map: Map, adjacency: Adjacency):
+        self.map = map
+        self.width = map.width
+        self.height = map.height
+        # component of every field, indexed by y * width + x
+        self.components = array('l', [-1]) * (map.width * map.height)
+        # condensation DAG: the components component c can step to are
+        # successors[offsets[c]:offsets[c + 1]]
+        self.offsets = array('l', [0])
+        self.successors = array('l')
+        # first label: [lows[c], c] with the Tarjan number as rank, second label: [others[c], ranks[c]]
+        # with the post order rank of a search of the DAG that tries the successors in reverse
+        self.lows = array('l')
+        self.ranks = array('l')
+        self.others = array('l')
+        self._build(adjacency)
+        self._label()
+
+    def _build(self, adjacency: Adjacency):
+        # Iterative Tarjan: a component is complete once the search returns to its first field,
+        # components are completed in reverse topological order, so every component a completed
+        # one can step to already has its number and its first label
+        offsets = adjacency.offsets
+        neighbours = adjacency.neighbours
+        components = self.components
+        successors = self.successors
+        lows = self.lows
+        size = self.width * self.height
+        order = array('l', [-1]) * size
+        low = array('l', [0]) * size
+        stack = []
+        counter = 0
+        for root in range(size):
+            if order[root] >= 0:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            # fields of the current search path and for each the next move to try
+            work = [[root, offsets[root]]]
+            while work:
+                entry = work[-1]
+                index, i = entry
+                if i < offsets[index + 1]:
+                    entry[1] += 1
+                    neigbor = neighbours[i]
+                    if order[neigbor] < 0:
+                        order[neigbor] = low[neigbor] = counter
+                        counter += 1
+                        stack.append(neigbor)
+                        work.append([neigbor, offsets[neigbor]])
+                    elif components[neigbor] < 0 and order[neigbor] < low[index]:
+                        low[index] = order[neigbor]
+                    continue
+                work.pop()
+                if work and low[index] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[index]
+                if low[index] != order[index]:
+                    continue
+                component = len(lows)
+                members = []
+                while True:
+                    member = stack.pop()
+                    components[member] = component
+                    members.append(member)
+                    if member == index:
+                        break
+                lowest = component
+                found = set()
+                for member in members:
+                    for j in range(offsets[member], offsets[member + 1]):
+                        other = components[neighbours[j]]
+                        if other != component and other not in found:
+                            found.add(other)
+                            successors.append(other)
+                            if lows[other] < lowest:
+                                lowest = lows[other]
+                self.offsets.append(len(successors))
+                lows.append(lowest)
+
+    def _label(self):
+        # Second label: post order search of the DAG from the highest component down, trying the
+        # successors in reverse, every component gets its rank and the lowest rank it can reach
+        offsets = self.offsets
+        successors = self.successors
+        count = len(self.lows)
+        ranks = array('l', [-1]) * count
+        others = array('l', [0]) * count
+        rank = 0
+        for root in range(count - 1, -1, -1):
+            if ranks[root] >= 0:
+                continue
+            # rank -2 marks components on the search path, a DAG never leads back to them
+            ranks[root] = -2
+            work = [[root, offsets[root + 1]]]
+            while work:
+                entry = work[-1]
+                component, i = entry
+                if i > offsets[component]:
+                    entry[1] -= 1
+                    successor = successors[i - 1]
+                    if ranks[successor] == -1:
+                        ranks[successor] = -2
+                        work.append([successor, offsets[successor + 1]])
+                    continue
+                work.pop()
+                lowest = rank
+                for j in range(offsets[component], offsets[component + 1]):
+                    if others[successors[j]] < lowest:
+                        lowest = others[successors[j]]
+                ranks[component] = rank
+                others[component] = lowest
+                rank += 1
+        self.ranks = ranks
+        self.others = others
+
+    def _may_reach(self, component: int, target: int) -> bool:
+        # False if the labels show that component can not reach target
+        return (target <= component and self.lows[component] <= self.lows[target]
+                and self.ranks[target] <= self.ranks[component] and self.others[component] <= self.others[target])
+
+    def get_component(self, field: Field) -> int:
+        # Get the number of the strongly connected component of the given field
+        if not self.map.is_on_map(field.x, field.y):
+            raise Exception(f"Field {(field.x, field.y)} is not on the map!")
+        return self.components[field.y * self.width + field.x]
+
+    def count_components(self) -> int:
+        # Get the number of strongly connected components
+        return len(self.lows)
+
+    def can_reach(self, start: Field, end: Field) -> bool:
+        # Return True if end can be reached from start with legal steps
+        component = self.get_component(start)
+        target = self.get_component(end)
+        if component == target:
+            return True
+        if not self._may_reach(component, target):
+            return False
+        # depth first search of the DAG, only through components the labels do not refute
+        offsets = self.offsets
+        successors = self.successors
+        seen = {component}
+        stack = [component]
+        while stack:
+            component = stack.pop()
+            for j in range(offsets[component], offsets[component + 1]):
+                successor = successors[j]
+                if successor == target:
+                    return True
+                if successor not in seen and self._may_reach(successor, target):
+                    seen.add(successor)
+                    stack.append(successor)
+        return False
+
+
 class Walker:
     # Walker class represents a walker with a position on the map
-    def __init__(self, position_information):
+    # the walker climbs by the policy of its map, or the given policy (default: DEFAULT_POLICY)
+    # the solvers only accept a walker that climbs by the policy of the map it is solved on
+    def __init__(self, position_information, policy=None):
         # Initialize the walker's position from field or get from the map
+        self.map = None
         if isinstance(position_information, Map):
+            self.map = position_information
             self.position = position_information.start
         elif isinstance(position_information, Field): 
             self.position = position_information
+        if policy is None:
+            policy = self.map.policy if self.map is not None else DEFAULT_POLICY
+        self.policy = policy
 
     def can_climb(self, field):
-        if self.position.elevation + 1 == field.elevation:
-            return True
-        elif self.position.elevation >= field.elevation:
-            return True
-        return False
+        return self.policy.allows(self.position.elevation, field.elevation)
     
-    def count_climbable_neighbors(self, neigbors):
-        #neigbors comes in tuple NSWE
+    def count_climbable_neighbors(self, neigbors=None):
+        # neigbors comes in tuple NSWE
+        # a walker on a map looks the moves of its position up in the move masks of the map,
+        # the neigbors are only needed by a walker without a map
+        if self.map is not None and self.map.is_on_map(self.position.x, self.position.y):
+            return sum(bool(mask[self.position.y, self.position.x]) for mask in self.map.get_masks(self.policy))
         (n, s, w, e) = neigbors
         count = 0
         if self.can_climb(n):
@@ -141,80 +646,588 @@ class Walker:
 
 class Path:
     # Path class represents a sequence of fields forming a path on the map
+    # the steps are stored as a chain of (field, previous step) pairs, so adding and removing
+    # steps never copies the path and snapshots can share the chain
     def __init__(self, walker=None):
-        # Initialize an empty list of fields
-        self.fields = []
+        # Initialize an empty path
+        self.last = None
+        self.length = 0
+        # number of visits per field, None for snapshots until field_visited needs it
+        self.visits = {}
+        # list of fields built by the fields property, dropped when a step is added or removed
+        self.built = None
         # If creation with walker, add start to fields
         if isinstance(walker, Walker):
-            self.fields.append(walker.position)
+            self.add_step(walker.position)
+
+    @property
+    def fields(self):
+        # Materialise the list of fields of the path, from start to end
+        # the list is built once and kept until the path changes
+        if self.built is not None:
+            return self.built
+        fields = []
+        step = self.last
+        while step is not None:
+            fields.append(step[0])
+            step = step[1]
+        fields.reverse()
+        self.built = fields
+        return fields
+
+    @fields.setter
+    def fields(self, fields):
+        # Replace all steps of the path by the given fields
+        self.last = None
+        self.length = 0
+        self.visits = {}
+        for field in fields:
+            self.add_step(field)
+        self.built = list(fields)
 
     def add_step(self, field: Field):
         # Add a new step to the path
-        self.fields.append(field)
+        self.last = (field, self.last)
+        self.length += 1
+        self.built = None
+        if self.visits is not None:
+            self.visits[field] = self.visits.get(field, 0) + 1
 
     def remove_last_step(self):
         # Remove the last step from the path
-        if self.fields:
-            self.fields.pop()
+        if self.last is not None:
+            field = self.last[0]
+            self.last = self.last[1]
+            self.length -= 1
+            self.built = None
+            if self.visits is not None:
+                self.visits[field] -= 1
+                if not self.visits[field]:
+                    del self.visits[field]
 
     def get_length(self):
-        return len(self.fields)
+        return self.length
     
     def get_end(self) -> Field:
-        if not self.fields:
+        if self.last is None:
             return None
-        return self.fields[len(self.fields) - 1]
+        return self.last[0]
     
     def field_visited(self, field) -> bool:
-        for f in self.fields:
-            if f == field:
-                return True
-        return False
- 
+        if self.visits is None:
+            self.visits = {}
+            for f in self.fields:
+                self.visits[f] = self.visits.get(f, 0) + 1
+        return field in self.visits
+
+    def snapshot(self):
+        # Return a copy of the path in O(1), sharing the steps with this path
+        snapshot = Path()
+        snapshot.last = self.last
+        snapshot.length = self.length
+        snapshot.visits = None
+        return snapshot
+
+
+class DistanceField:
+    # DistanceField holds the number of steps from every field of a map to one target field
+    # together with the next field on a shortest way there
+    def __init__(self, map: Map, target: Field):
+        self.map = map
+        self.target = target
+        # climbing policy of the map the distances were solved with
+        self.policy = map.policy
+        # both arrays are indexed by y * width + x, -1 marks fields that can not reach the target
+        self.distances = array('l', [-1]) * (map.width * map.height)
+        self.successors = array('l', [-1]) * (map.width * map.height)
+        # indices of all fields that can reach the target, sorted by distance
+        self.order = array('l')
+
+    def get_distance(self, x, y):
+        # Get the number of steps from x, y to the target, None if it is unreachable
+        if not self.map.is_on_map(x, y) or self.distances[y * self.map.width + x] < 0:
+            return None
+        return self.distances[y * self.map.width + x]
+
+    def get_path(self, field: Field) -> Path:
+        # Get a shortest path from the given field to the target, None if it is unreachable
+        if self.get_distance(field.x, field.y) is None:
+            return None
+        path = Path()
+        index = self.map.get_index(field)
+        while index >= 0:
+            path.add_step(self.map.get_field_at(index))
+            index = self.successors[index]
+        return path
+
+    def get_nearest(self, elevation=0) -> Field:
+        # Get the field with the given elevation that is closest to the target, None if there is none
+        for index in self.order:
+            field = self.map.get_field_at(index)
+            if field.elevation == elevation:
+                return field
+        return None
+
+
+class SearchStats:
+    # SearchStats collects the counters and phase timings of one solve
+    def __init__(self, engine=None):
+        self.engine = engine
+        # fields taken from the frontier, for the bidirectional engine split into both sides
+        self.expanded = 0
+        self.expanded_forward = 0
+        self.expanded_backward = 0
+        # calls of the climbing rule (building the adjacency index or testing neighbours directly)
+        self.edges_tested = 0
+        # legal moves looked at by the search
+        self.edges_scanned = 0
+        # largest number of fields waiting in the frontier at once
+        self.peak_frontier = 0
+        # phase timings in seconds, parse is the time the map needed to be created
+        self.parse_seconds = 0.0
+        self.index_seconds = 0.0
+        self.search_seconds = 0.0
+        self.reconstruct_seconds = 0.0
+        # True if the reachability index showed that the end can not be reached, nothing was searched
+        self.unreachable = False
+
+    def __repr__(self):
+        return f'SearchStats({", ".join(f"{name}={value}" for name, value in vars(self).items())})'
+
+    def as_dict(self):
+        # Return the stats as plain dict, e.g. for reports
+        return dict(vars(self))
 
 
 class ShortestPathFinder:
     shortest_path = None
+    # SearchStats of the last solve
+    stats = None
+
+    @staticmethod
+    def solve(map: Map, path: Path, walker: Walker, engine: str = "bfs", on_expand=None, on_goal=None) -> Path:
+        # Solve the map from the walker position to the end of the map
+        # engine selects the search: "bfs" (default), "astar", "bidirectional", "wavefront"
+        # or the exhaustive "dfs", all of them step by the climbing policy of the map, which
+        # has to be the policy of the walker
+        # on_expand(field) is called for every expanded field, on_goal(path) once with the found path,
+        # both are optional and cost nothing when not given
+        # if the reachability index of the map was built (always for "dfs"), an unreachable end is
+        # answered without searching
+        # returns the shortest path (also stored in shortest_path) or None if the end is unreachable,
+        # the stats of the search are stored in stats
+        return ShortestPathFinder.solve_with_stats(map, path, walker, engine, on_expand, on_goal)[0]
+
+    @staticmethod
+    def solve_with_stats(map: Map, path: Path, walker: Walker, engine: str = "bfs", on_expand=None, on_goal=None):
+        # Like solve, but returns the shortest path together with the SearchStats of the search
+        stats = SearchStats(engine)
+        stats.parse_seconds = map.parse_seconds
+        started = time.perf_counter()
+        if engine not in ("bfs", "astar", "bidirectional", "wavefront", "dfs"):
+            raise Exception(f"Unknown engine {engine}!")
+        # the indices the engines search are compiled for the policy of the map
+        if walker.policy != map.policy:
+            raise Exception("The walker has to climb by the policy of the map!")
+        if not map.is_on_map(walker.position.x, walker.position.y):
+            raise Exception(f"Field {(walker.position.x, walker.position.y)} is not on the map!")
+        # the exhaustive dfs would try every route before giving up, so the index is worth building
+        reachability = map.get_reachability(build=engine == "dfs")
+        stats.index_seconds += time.perf_counter() - started
+        if reachability is not None and not reachability.can_reach(walker.position, map.end):
+            stats.unreachable = True
+            ShortestPathFinder.shortest_path = None
+        elif engine == "bfs":
+            ShortestPathFinder.shortest_path = ShortestPathFinder._solve_bfs(map, path, walker, stats, on_expand)
+        elif engine == "astar":
+            ShortestPathFinder.shortest_path = ShortestPathFinder._solve_astar(map, path, walker, stats, on_expand)
+        elif engine == "bidirectional":
+            ShortestPathFinder.shortest_path = ShortestPathFinder._solve_bidirectional(map, path, walker, stats, on_expand)
+        elif engine == "wavefront":
+            # imported here, as the wavefront module imports this one
+            from . import wavefront
+            ShortestPathFinder.shortest_path = wavefront.solve(map, path, walker.position, stats, on_expand)
+        elif engine == "dfs":
+            ShortestPathFinder.shortest_path = None
+            ShortestPathFinder._solve_dfs(map, path, walker, stats, on_expand)
+        stats.search_seconds = time.perf_counter() - started - stats.index_seconds - stats.reconstruct_seconds
+        ShortestPathFinder.stats = stats
+        if on_goal is not None and ShortestPathFinder.shortest_path is not None:
+            on_goal(ShortestPathFinder.shortest_path)
+        return ShortestPathFinder.shortest_path, stats
+
+    @staticmethod
+    def _get_adjacency(map: Map, stats: SearchStats, reverse: bool = False) -> Adjacency:
+        # Get the default adjacency index of the map, accounting the time and the climbing rule
+        # calls to the stats if it had to be built
+        started = time.perf_counter()
+        cached = map.adjacencies.get((map.policy, reverse))
+        adjacency = map.get_adjacency(reverse=reverse)
+        if adjacency is not cached:
+            stats.edges_tested += adjacency.rule_calls
+        stats.index_seconds += time.perf_counter() - started
+        return adjacency
+
+    @staticmethod
+    def _solve_bfs(map: Map, path: Path, walker: Walker, stats: SearchStats, on_expand=None) -> Path:
+        # Breadth first search from the walker position to the end of the map
+        end = map.get_index(map.end)
+        parents = ShortestPathFinder._search_forward(map, map.get_index(walker.position), stats, end, on_expand)
+        if parents[end] < 0:
+            return None
+        return ShortestPathFinder._build_path(map, path, end, parents, stats=stats)
+
+    @staticmethod
+    def _search_forward(map: Map, start: int, stats: SearchStats, end: int = -1, on_expand=None) -> array:
+        # Breadth first search over the adjacency index, every field is expanded at most once
+        # stops when end was expanded (never for -1), returns for each field the index it was
+        # reached from (-1: not reached, the start is its own parent)
+        adjacency = ShortestPathFinder._get_adjacency(map, stats)
+        offsets = adjacency.offsets
+        neighbours = adjacency.neighbours
+        parents = array('l', [-1]) * (map.width * map.height)
+        parents[start] = start
+        queue = deque([start])
+        expanded = 0
+        scanned = 0
+        peak = 1
+        while queue:
+            index = queue.popleft()
+            expanded += 1
+            if on_expand is not None:
+                on_expand(map.get_field_at(index))
+            if index == end:
+                break
+            scanned += offsets[index + 1] - offsets[index]
+            for i in range(offsets[index], offsets[index + 1]):
+                neigbor = neighbours[i]
+                if parents[neigbor] < 0:
+                    parents[neigbor] = index
+                    queue.append(neigbor)
+            if len(queue) > peak:
+                peak = len(queue)
+        stats.expanded += expanded
+        stats.expanded_forward += expanded
+        stats.edges_scanned += scanned
+        stats.peak_frontier = max(stats.peak_frontier, peak)
+        return parents
+
+    @staticmethod
+    def _estimate(map: Map, index: int, target: Field) -> int:
+        # Lower bound of the steps from index to target: every step moves one field, climbs at
+        # most max_climb and descends at most max_descent levels of the policy of the map,
+        # so none of the distances can be covered faster
+        x = index % map.width
+        y = index // map.width
+        policy = map.policy
+        estimate = abs(target.x - x) + abs(target.y - y)
+        rise = target.elevation - map.get_field(x, y).elevation
+        if rise > 0 and policy.max_climb > 0:
+            estimate = max(estimate, -(-rise // policy.max_climb))
+        elif rise < 0 and policy.max_descent:
+            estimate = max(estimate, -(rise // policy.max_descent))
+        return estimate
+
+    @staticmethod
+    def _solve_astar(map: Map, path: Path, walker: Walker, stats: SearchStats, on_expand=None) -> Path:
+        # A* search over the adjacency index using the _estimate lower bound
+        # the estimate is consistent, so a field is final the first time it is taken from the heap
+        # ties are broken towards the lower estimate, which follows the most promising field first
+        adjacency = ShortestPathFinder._get_adjacency(map, stats)
+        offsets = adjacency.offsets
+        neighbours = adjacency.neighbours
+        start = map.get_index(walker.position)
+        end = map.get_index(map.end)
+        parents = array('l', [-1]) * (map.width * map.height)
+        steps = array('l', [-1]) * (map.width * map.height)
+        closed = bytearray(map.width * map.height)
+        parents[start] = start
+        steps[start] = 0
+        estimate = ShortestPathFinder._estimate(map, start, map.end)
+        heap = [(estimate, estimate, start)]
+        expanded = 0
+        scanned = 0
+        peak = 1
+        while heap:
+            _, _, index = heappop(heap)
+            if closed[index]:
+                continue
+            closed[index] = 1
+            expanded += 1
+            if on_expand is not None:
+                on_expand(map.get_field_at(index))
+            if index == end:
+                break
+            distance = steps[index] + 1
+            scanned += offsets[index + 1] - offsets[index]
+            for i in range(offsets[index], offsets[index + 1]):
+                neigbor = neighbours[i]
+                if closed[neigbor] or 0 <= steps[neigbor] <= distance:
+                    continue
+                steps[neigbor] = distance
+                parents[neigbor] = index
+                estimate = ShortestPathFinder._estimate(map, neigbor, map.end)
+                heappush(heap, (distance + estimate, estimate, neigbor))
+            if len(heap) > peak:
+                peak = len(heap)
+        stats.expanded = stats.expanded_forward = expanded
+        stats.edges_scanned = scanned
+        stats.peak_frontier = peak
+        if not closed[end]:
+            return None
+        return ShortestPathFinder._build_path(map, path, end, parents, stats=stats)
 
     @staticmethod
-    def solve(map: Map, path: Path, walker: Walker) -> Path:
+    def _solve_bidirectional(map: Map, path: Path, walker: Walker, stats: SearchStats, on_expand=None) -> Path:
+        # Breadth first search from the walker position forwards and from the end backwards
+        # the side with the smaller frontier expands one complete layer at a time, the search
+        # stops after the first layer in which the two sides meet
+        forward = ShortestPathFinder._get_adjacency(map, stats)
+        backward = ShortestPathFinder._get_adjacency(map, stats, reverse=True)
+        start = map.get_index(walker.position)
+        end = map.get_index(map.end)
+        parents = array('l', [-1]) * (map.width * map.height)
+        successors = array('l', [-1]) * (map.width * map.height)
+        steps_forward = array('l', [-1]) * (map.width * map.height)
+        steps_backward = array('l', [-1]) * (map.width * map.height)
+        parents[start] = start
+        successors[end] = end
+        steps_forward[start] = 0
+        steps_backward[end] = 0
+        frontier_forward = [start]
+        frontier_backward = [end]
+        meet = start if start == end else -1
+        while meet < 0 and frontier_forward and frontier_backward:
+            stats.peak_frontier = max(stats.peak_frontier, len(frontier_forward) + len(frontier_backward))
+            if len(frontier_forward) <= len(frontier_backward):
+                stats.expanded_forward += len(frontier_forward)
+                frontier_forward, meet = ShortestPathFinder._expand_layer(
+                    map, frontier_forward, forward, parents, steps_forward, steps_backward, stats, on_expand)
+            else:
+                stats.expanded_backward += len(frontier_backward)
+                frontier_backward, meet = ShortestPathFinder._expand_layer(
+                    map, frontier_backward, backward, successors, steps_backward, steps_forward, stats, on_expand)
+        stats.expanded = stats.expanded_forward + stats.expanded_backward
+        if meet < 0:
+            return None
+        return ShortestPathFinder._build_path(map, path, meet, parents, successors, stats)
+
+    @staticmethod
+    def _expand_layer(map: Map, frontier: list, adjacency: Adjacency, links: array, steps: array, other_steps: array,
+                      stats: SearchStats, on_expand=None):
+        # Expand all fields of one breadth first layer, returns the next layer and the best
+        # field where this side met the other one (-1 if they did not meet)
+        offsets = adjacency.offsets
+        neighbours = adjacency.neighbours
+        layer = []
+        meet = -1
+        for index in frontier:
+            if on_expand is not None:
+                on_expand(map.get_field_at(index))
+            distance = steps[index] + 1
+            stats.edges_scanned += offsets[index + 1] - offsets[index]
+            for i in range(offsets[index], offsets[index + 1]):
+                neigbor = neighbours[i]
+                if steps[neigbor] >= 0:
+                    continue
+                steps[neigbor] = distance
+                links[neigbor] = index
+                layer.append(neigbor)
+                if other_steps[neigbor] >= 0 and (meet < 0 or other_steps[neigbor] < other_steps[meet]):
+                    meet = neigbor
+        return layer, meet
+
+    @staticmethod
+    def distance_field(map: Map, target: Field = None) -> DistanceField:
+        # Reverse breadth first search from the target (default: end of the map)
+        # uses the reversed adjacency index: a step from neigbor to index is legal
+        if target is None:
+            target = map.end
+        adjacency = map.get_adjacency(reverse=True)
+        offsets = adjacency.offsets
+        neighbours = adjacency.neighbours
+        result = DistanceField(map, target)
+        distances = result.distances
+        successors = result.successors
+        start = map.get_index(target)
+        distances[start] = 0
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            result.order.append(index)
+            distance = distances[index] + 1
+            for i in range(offsets[index], offsets[index + 1]):
+                neigbor = neighbours[i]
+                if distances[neigbor] < 0:
+                    distances[neigbor] = distance
+                    successors[neigbor] = index
+                    queue.append(neigbor)
+        return result
+
+    @staticmethod
+    def solve_best_start(map: Map, elevation: int = 0) -> Path:
+        # Find the shortest path to the end of the map from any field with the given elevation
+        # uses a single reverse search instead of solving once per possible start
+        distances = ShortestPathFinder.distance_field(map)
+        start = distances.get_nearest(elevation)
+        if start is None:
+            return None
+        return distances.get_path(start)
+
+    @staticmethod
+    def solve_batch(map: Map, pairs: list) -> list:
+        # Find the shortest paths for many (start, end) pairs of fields on the same map
+        # the pairs are grouped by end or by start, whichever gives fewer groups, and every
+        # group is answered by one search; returns the paths in the order of the pairs,
+        # None for pairs where the end can not be reached
+        for pair in pairs:
+            for field in pair:
+                if not map.is_on_map(field.x, field.y):
+                    raise Exception(f"Field {(field.x, field.y)} is not on the map!")
+        starts = {}
+        ends = {}
+        for number, (start, end) in enumerate(pairs):
+            starts.setdefault(map.get_index(start), []).append(number)
+            ends.setdefault(map.get_index(end), []).append(number)
+        results = [None] * len(pairs)
+        if len(ends) <= len(starts):
+            for end, numbers in ends.items():
+                distances = ShortestPathFinder.distance_field(map, map.get_field_at(end))
+                for number in numbers:
+                    results[number] = distances.get_path(pairs[number][0])
+        else:
+            for start, numbers in starts.items():
+                parents = ShortestPathFinder._search_forward(map, start, SearchStats())
+                for number in numbers:
+                    end = map.get_index(pairs[number][1])
+                    if parents[end] >= 0:
+                        results[number] = ShortestPathFinder._build_path(map, Path(), end, parents)
+        return results
+
+    @staticmethod
+    def count_shortest_paths(map: Map, start: Field = None, end: Field = None) -> int:
+        # Count all shortest paths from start (default: start of the map) to end (default: end of the map)
+        # in one breadth first pass, 0 if the end is unreachable
+        end = map.end if end is None else end
+        counts = ShortestPathFinder._count_layers(map, start, end)[1]
+        return counts[map.get_index(end)]
+
+    @staticmethod
+    def iter_shortest_paths(map: Map, start: Field = None, end: Field = None):
+        # Yield every shortest path from start (default: start of the map) to end (default: end of the map)
+        # one after the other, only the path that is currently built is held in memory
+        # walks back from end over the reversed adjacency index, always to a field one layer
+        # closer to the start, so every branch ends at the start and nothing has to be undone
+        end = map.end if end is None else end
+        distances = ShortestPathFinder._count_layers(map, start, end)[0]
+        last = map.get_index(end)
+        if distances[last] < 0:
+            return
+        adjacency = map.get_adjacency(reverse=True)
+        offsets = adjacency.offsets
+        neighbours = adjacency.neighbours
+        # fields from end back towards the start and for each the next reverse move to try
+        steps = [last]
+        moves = [offsets[last]]
+        while steps:
+            index = steps[-1]
+            if distances[index] == 0:
+                result = Path()
+                result.fields = [map.get_field_at(step) for step in reversed(steps)]
+                yield result
+            elif moves[-1] < offsets[index + 1]:
+                neigbor = neighbours[moves[-1]]
+                moves[-1] += 1
+                if distances[neigbor] == distances[index] - 1:
+                    steps.append(neigbor)
+                    moves.append(offsets[neigbor])
+                continue
+            steps.pop()
+            moves.pop()
+
+    @staticmethod
+    def _count_layers(map: Map, start: Field, end: Field):
+        # Breadth first search from start (default: start of the map) that stops when end was expanded
+        # returns for each field the number of steps from start (-1: not reached) and the number
+        # of shortest paths to it: the sum of the counts of the fields one layer closer to the start
+        # it can be reached from; the counts are Python ints, so they can not overflow
+        start = map.start if start is None else start
+        for field in (start, end):
+            if not map.is_on_map(field.x, field.y):
+                raise Exception(f"Field {(field.x, field.y)} is not on the map!")
+        adjacency = map.get_adjacency()
+        offsets = adjacency.offsets
+        neighbours = adjacency.neighbours
+        distances = array('l', [-1]) * (map.width * map.height)
+        counts = [0] * (map.width * map.height)
+        first = map.get_index(start)
+        last = map.get_index(end)
+        distances[first] = 0
+        counts[first] = 1
+        queue = deque([first])
+        while queue:
+            index = queue.popleft()
+            # all fields of the layer before end were expanded, so its count is complete
+            if index == last:
+                break
+            distance = distances[index] + 1
+            for i in range(offsets[index], offsets[index + 1]):
+                neigbor = neighbours[i]
+                if distances[neigbor] < 0:
+                    distances[neigbor] = distance
+                    queue.append(neigbor)
+                if distances[neigbor] == distance:
+                    counts[neigbor] += counts[index]
+        return distances, counts
+
+    @staticmethod
+    def _build_path(map: Map, path: Path, end: int, parents: array, successors: array = None,
+                    stats: SearchStats = None) -> Path:
+        # Follow the parents back from end and append the steps to a copy of the given path
+        # the start of the search is its own parent
+        # if successors are given, the path continues from end along them up to the field that is its own successor
+        started = time.perf_counter()
+        steps = [map.get_field_at(end)]
+        index = end
+        while parents[index] != index:
+            index = parents[index]
+            steps.append(map.get_field_at(index))
+        steps.reverse()
+        index = end
+        while successors is not None and successors[index] != index:
+            index = successors[index]
+            steps.append(map.get_field_at(index))
+        result = Path()
+        previous = path.fields
+        result.fields = previous[:-1] + steps if previous else steps
+        if stats is not None:
+            stats.reconstruct_seconds += time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _solve_dfs(map: Map, path: Path, walker: Walker, stats: SearchStats, on_expand=None):
+        # Exhaustive depth first search over all paths without loops, keeps the shortest one found
+        stats.expanded += 1
+        stats.expanded_forward += 1
+        stats.peak_frontier = max(stats.peak_frontier, path.get_length())
+        if on_expand is not None:
+            on_expand(walker.position)
         if walker.position == map.end:
-            print(f"{path.get_length()}")
             if ShortestPathFinder.shortest_path is None:
-                ShortestPathFinder.shortest_path = copy.deepcopy(path)
+                ShortestPathFinder.shortest_path = path.snapshot()
             elif path.get_length() < ShortestPathFinder.shortest_path.get_length():
-                ShortestPathFinder.shortest_path = copy.deepcopy(path)   
+                ShortestPathFinder.shortest_path = path.snapshot()
             return   
         
-        for neigbor in map.get_neighbours(walker.position):
-            if walker.can_climb(neigbor) and not path.field_visited(neigbor):
+        x, y = walker.position.x, walker.position.y
+        for neigbor, mask in zip(map.get_neighbours(walker.position), map.get_masks()):
+            stats.edges_tested += 1
+            if mask[y, x] and not path.field_visited(neigbor):
+                stats.edges_scanned += 1
                 walker.position = neigbor
                 path.add_step(walker.position)
                 
-                ShortestPathFinder.solve(map, path, walker)
+                ShortestPathFinder._solve_dfs(map, path, walker, stats, on_expand)
                 
                 path.remove_last_step()
-                walker.position = path.fields[-1]
-                    
-        ShortestPathFinder.shortest_path 
-
-
-    
-if __name__ == '__main__':
-    from visu import plot_path
-
-    # GIVEN a mutli line string with a full map 
-    map_string = """\
-Sabqponm
-abcryxxl
-accszExk
-acctuvwj
-abdefghi""";
-
-    world = Map.from_string(map_string)
-    walker = Walker(world)
-    path = Path(walker)
-
-    # THEN the path length should be 31 and the ending field 2, 5, 25
-    ShortestPathFinder.solve(world, path, walker)
-    plot_path(ShortestPathFinder.shortest_path.fields, 5, 8)
+                walker.position = path.get_end()
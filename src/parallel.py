@@ -0,0 +1,59 @@
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .model import Map, Walker, Path, ShortestPathFinder
+from .binary import load_map
+
+
+def solve_map(world: Map, engine="bfs", include_path=False, include_stats=False):
+    # Solve a map from its start to its end, returns a dict with the number of steps (None if the
+    # end is unreachable), the steps as (x, y) pairs if include_path is set and the SearchStats
+    # as dict if include_stats is set, together with the shortest path
+    if not hasattr(world, "start") or not hasattr(world, "end"):
+        raise Exception("Map needs a start and an end!")
+    walker = Walker(world)
+    shortest, stats = ShortestPathFinder.solve_with_stats(world, Path(walker), walker, engine=engine)
+    result = {"steps": None if shortest is None else shortest.get_length() - 1}
+    if include_path:
+        result["path"] = None if shortest is None else [(field.x, field.y) for field in shortest.fields]
+    if include_stats:
+        result["stats"] = stats.as_dict()
+    return result, shortest
+
+
+def solve_file(file_name, engine="bfs", include_path=False, include_stats=False):
+    # Solve the map in the given (text or binary) map file, returns a dict with the file name and the result of
+    # solve_map or the error message instead if the map could not be solved
+    result = {"file": file_name}
+    try:
+        result.update(solve_map(load_map(file_name), engine, include_path, include_stats)[0])
+    except Exception as error:
+        result["error"] = str(error)
+    return result
+
+
+def _solve_chunk(file_names, engine, include_path, include_stats=False):
+    # Worker entry point, solves a chunk of files in one go
+    return [solve_file(file_name, engine, include_path, include_stats) for file_name in file_names]
+
+
+def solve_files(file_names, workers=None, chunk_size=1, engine="bfs", include_path=False, include_stats=False):
+    # Solve the given map files in a pool of worker processes and yield the results as they finish
+    # only the file names are sent to the workers, they read and parse the maps themselves
+    # workers defaults to the number of cores, chunk_size files are sent to a worker at once
+    if chunk_size < 1:
+        raise Exception("Chunk size must be at least 1!")
+    file_names = list(file_names)
+    chunks = [file_names[i:i + chunk_size] for i in range(0, len(file_names), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_solve_chunk, chunk, engine, include_path, include_stats) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def solve_directory(directory, pattern="*.txt", workers=None, chunk_size=1, engine="bfs", include_path=False,
+                    include_stats=False):
+    # Solve all map files in directory matching pattern, see solve_files
+    file_names = sorted(glob.glob(os.path.join(directory, pattern)))
+    yield from solve_files(file_names, workers, chunk_size, engine, include_path, include_stats)
@@ -0,0 +1,231 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+
+from .model import Map, Field, ShortestPathFinder
+from .cache import DistanceFieldCache
+
+
+class SolveService:
+    # SolveService answers solve requests over a stream of JSON lines, one message per line
+    #   {"op": "map", "map": "<map string>"}                  -> {"map_id": ..., "width": ..., "height": ...}
+    #   {"op": "solve", "map_id": ..., "start": [x, y], "target": [x, y], "path": true}
+    #                                                          -> {"steps": ..., "path": [[x, y], ...]}
+    #   {"op": "metrics"}                                      -> see get_metrics
+    # start and target default to the start and end of the map, errors are answered with {"error": ...}
+    # Solves run in an executor, so the event loop keeps serving while a large map is solved.
+    # Every target of a map is solved once as distance field, requests for a target that is being
+    # solved wait for that computation, finished distance fields are kept in a DistanceFieldCache.
+    def __init__(self, executor=None, cache_size=32, latency_window=1000):
+        # executor runs the parsing and solving (default: the executor of the event loop)
+        # latency_window is the number of recent requests the latency percentiles are taken from
+        self.executor = executor
+        self.maps = {}
+        self.cache = DistanceFieldCache(cache_size)
+        # running computations, keyed by (map id, target x, target y)
+        self.pending = {}
+        # requests that are waiting for a computation
+        self.waiting = 0
+        self.requests = 0
+        self.computations = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=latency_window)
+
+    async def run_in_executor(self, function, *args):
+        # Run function in the executor without blocking the event loop
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def add_map(self, map_string: str) -> str:
+        # Parse and register a map, returns its id (the content hash, equal maps share one id)
+        world = await self.run_in_executor(Map.from_string, map_string, True)
+        map_id = world.get_content_hash()
+        self.maps.setdefault(map_id, world)
+        return map_id
+
+    def get_map(self, map_id: str) -> Map:
+        # Get a registered map
+        world = self.maps.get(map_id)
+        if world is None:
+            raise Exception(f"Unknown map {map_id}!")
+        return world
+
+    def get_field(self, world: Map, position, default_name):
+        # Get the field at the [x, y] position of a message, or the start or end of the map
+        if position is None:
+            if not hasattr(world, default_name):
+                raise Exception("Map needs a start and an end!")
+            return getattr(world, default_name)
+        x, y = position
+        if not world.is_on_map(x, y):
+            raise Exception(f"Field {(x, y)} is not on the map!")
+        return world.get_field(x, y)
+
+    async def get_distance_field(self, map_id: str, target: Field):
+        # Get the distance field of the map to target from the cache, a running computation or
+        # a new computation in the executor
+        world = self.get_map(map_id)
+        distances = self.cache.get_cached(world, target)
+        if distances is not None:
+            return distances
+        key = (map_id, target.x, target.y)
+        future = self.pending.get(key)
+        if future is None:
+            self.computations += 1
+            future = asyncio.ensure_future(self.run_in_executor(ShortestPathFinder.distance_field, world, target))
+            self.pending[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        self.waiting += 1
+        try:
+            # shielded, so a cancelled request does not cancel the computation of the others
+            return await asyncio.shield(future)
+        finally:
+            self.waiting -= 1
+
+    def _finish(self, key, future):
+        # Called when a computation is done, moves its result into the cache
+        del self.pending[key]
+        if not future.cancelled() and future.exception() is None:
+            self.cache.add(future.result())
+
+    async def solve(self, message: dict) -> dict:
+        # Answer a solve message
+        world = self.get_map(message.get("map_id"))
+        start = self.get_field(world, message.get("start"), "start")
+        target = self.get_field(world, message.get("target"), "end")
+        distances = await self.get_distance_field(message["map_id"], target)
+        shortest = distances.get_path(start)
+        response = {"steps": None if shortest is None else shortest.get_length() - 1}
+        if message.get("path"):
+            response["path"] = None if shortest is None else [[field.x, field.y] for field in shortest.fields]
+        return response
+
+    async def handle_message(self, message: dict) -> dict:
+        # Answer one message, errors are answered with the error message
+        started = time.perf_counter()
+        self.requests += 1
+        try:
+            operation = message.get("op")
+            if operation == "map":
+                map_id = await self.add_map(message["map"])
+                world = self.maps[map_id]
+                response = {"map_id": map_id, "width": world.width, "height": world.height}
+            elif operation == "solve":
+                response = await self.solve(message)
+            elif operation == "metrics":
+                response = self.get_metrics()
+            else:
+                raise Exception(f"Unknown operation {operation}!")
+        except Exception as error:
+            self.errors += 1
+            response = {"error": str(error)}
+        self.latencies.append(time.perf_counter() - started)
+        return response
+
+    async def handle_connection(self, reader, writer):
+        # Serve one client: answer every line as soon as its message is done, the messages of
+        # one client are handled concurrently, so the answers can come in another order
+        # an "id" in a message is copied into its answer
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line):
+            try:
+                message = json.loads(line)
+            except ValueError:
+                message = None
+            if isinstance(message, dict):
+                response = await self.handle_message(message)
+                if "id" in message:
+                    response["id"] = message["id"]
+            else:
+                self.errors += 1
+                response = {"error": "Invalid message!"}
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        # Start serving on a TCP port (0: any free port), returns the asyncio server
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def start_unix(self, path):
+        # Start serving on a Unix socket, returns the asyncio server
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+    def get_metrics(self) -> dict:
+        # Get the counters of the service and the latency of the recent requests in seconds
+        latencies = sorted(self.latencies)
+
+        def percentile(share):
+            return latencies[min(len(latencies) - 1, int(share * len(latencies)))] if latencies else None
+
+        return {
+            "maps": len(self.maps),
+            "queue_depth": len(self.pending),
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache.hits,
+            "errors": self.errors,
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+            "latency_max": latencies[-1] if latencies else None,
+        }
+
+
+async def send_request(reader, writer, message: dict) -> dict:
+    # Send one message to a service and read the next answer
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def serve(options):
+    # Run a service until it is stopped
+    service = SolveService(cache_size=options.cache_size)
+    if options.unix is not None:
+        server = await service.start_unix(options.unix)
+    else:
+        server = await service.start_tcp(options.host, options.port)
+    print(f"serving on {', '.join(str(socket.getsockname()) for socket in server.sockets)}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Serve solve requests as JSON lines.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on (default 8765)")
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=32, help="number of cached distance fields")
+    options = parser.parse_args(args)
+    try:
+        asyncio.run(serve(options))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import time
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from .model import Map, Field, read_map_rows
+
+
+class TiledMap(Map):
+    # TiledMap keeps the elevations of a map in a file of square tiles of tile_size x tile_size bytes
+    # tile (tx, ty) is stored at offset (ty * tiles_x + tx) * tile_size * tile_size, row by row, tiles at
+    # the right and bottom edge are padded. Only the cache_size most recently used tiles are held in
+    # memory, changed tiles are written back when they are evicted or on flush.
+    def __init__(self, tile_file, width, height, tile_size=256, cache_size=64):
+        # Open an existing tile file for a map of the given size
+        if tile_size < 1 or cache_size < 1:
+            raise Exception("Tile size and cache size must be at least 1!")
+        super().__init__()
+        self.fields = None
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.cache_size = cache_size
+        self.tiles_x = (width + tile_size - 1) // tile_size
+        self.tiles = OrderedDict()
+        self.dirty = set()
+        self.hits = 0
+        self.page_ins = 0
+        self.page_outs = 0
+        self.tile_file = open(tile_file, 'r+b')
+
+    def get_hit_rate(self):
+        # Get the share of tile accesses that were served from the cache
+        accesses = self.hits + self.page_ins
+        return self.hits / accesses if accesses else 0.0
+
+    def get_tile(self, tile_x, tile_y):
+        # Get the bytes of a tile, paging it in from the tile file if it is not cached
+        index = tile_y * self.tiles_x + tile_x
+        tile = self.tiles.get(index)
+        if tile is not None:
+            self.hits += 1
+            self.tiles.move_to_end(index)
+            return tile
+        tile_bytes = self.tile_size * self.tile_size
+        self.tile_file.seek(index * tile_bytes)
+        tile = bytearray(self.tile_file.read(tile_bytes))
+        if len(tile) != tile_bytes:
+            raise Exception(f"Tile {(tile_x, tile_y)} is missing in the tile file!")
+        self.page_ins += 1
+        self.tiles[index] = tile
+        if len(self.tiles) > self.cache_size:
+            self.write_tile(*self.tiles.popitem(last=False))
+        return tile
+
+    def write_tile(self, index, tile):
+        # Write a tile back to the tile file if it was changed
+        if index in self.dirty:
+            self.tile_file.seek(index * self.tile_size * self.tile_size)
+            self.tile_file.write(tile)
+            self.dirty.discard(index)
+            self.page_outs += 1
+
+    def flush(self):
+        # Write all changed tiles back to the tile file
+        for index, tile in self.tiles.items():
+            self.write_tile(index, tile)
+        self.tile_file.flush()
+
+    def close(self):
+        # Write back changed tiles and close the tile file
+        self.flush()
+        self.tile_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Close the tile file when leaving a with block, changed tiles are written back
+        self.close()
+
+    def add_field(self, x, y, elevation):
+        # Set the elevation of the field at given x, y coordinates
+        if not self.is_on_map(x, y):
+            raise Exception(f"Field {(x, y)} is not on the map!")
+        tile = self.get_tile(x // self.tile_size, y // self.tile_size)
+        tile[(y % self.tile_size) * self.tile_size + x % self.tile_size] = elevation
+        self.dirty.add(y // self.tile_size * self.tiles_x + x // self.tile_size)
+        self.invalidate()
+
+    def get_field(self, x, y):
+        # Get a new field object for the given x, y coordinates
+        if not self.is_on_map(x, y):
+            return self.get_outside_field(x, y)
+        tile = self.get_tile(x // self.tile_size, y // self.tile_size)
+        return Field(x, y, tile[(y % self.tile_size) * self.tile_size + x % self.tile_size])
+
+    def get_elevation_grid(self):
+        # Get the elevations of all fields as (height, width) int64 array
+        # every tile is copied into its block of the grid, so each tile is paged in only once
+        size = self.tile_size
+        grid = np.empty((self.height, self.width), dtype=np.int64)
+        for tile_y in range((self.height + size - 1) // size):
+            for tile_x in range(self.tiles_x):
+                block = grid[tile_y * size:(tile_y + 1) * size, tile_x * size:(tile_x + 1) * size]
+                tile = np.frombuffer(self.get_tile(tile_x, tile_y), dtype=np.uint8).reshape(size, size)
+                block[:] = tile[:block.shape[0], :block.shape[1]]
+        return grid
+
+    def get_elevations(self):
+        # Get the elevations of all fields as array, indexed by y * width + x, read tile by tile
+        elevations = array('q')
+        elevations.frombytes(self.get_elevation_grid().tobytes())
+        return elevations
+
+    @staticmethod
+    def from_file(file_name, tile_file, tile_size=256, cache_size=64):
+        # Static method to convert a map file into a tile file and open it as TiledMap
+        # the map file is streamed, only one band of tile_size rows is held in memory
+        if tile_size < 1 or cache_size < 1:
+            raise Exception("Tile size and cache size must be at least 1!")
+        started = time.perf_counter()
+        markers = {}
+        width = 0
+        height = 0
+        band = []
+        with open(tile_file, 'wb') as tiles:
+            for row in read_map_rows(file_name, markers):
+                width = len(row)
+                band.append(row)
+                height += 1
+                if len(band) == tile_size:
+                    TiledMap.write_band(tiles, band, width, tile_size)
+                    band = []
+            if band:
+                TiledMap.write_band(tiles, band, width, tile_size)
+        map_to_return = TiledMap(tile_file, width, height, tile_size, cache_size)
+        if 'E' in markers:
+            map_to_return.set_end(*markers['E'])
+        if 'S' in markers:
+            map_to_return.set_start(*markers['S'])
+        map_to_return.parse_seconds = time.perf_counter() - started
+        return map_to_return
+
+    @staticmethod
+    def write_band(tiles, band, width, tile_size):
+        # Write one band of up to tile_size rows as a line of padded tiles
+        for start in range(0, width, tile_size):
+            for row in band:
+                tiles.write(row[start:start + tile_size].ljust(tile_size, b'\0'))
+            tiles.write(bytes(tile_size * (tile_size - len(band))))
@@ -1,70 +1,135 @@
-import matplotlib.pyplot as plt
+import matplotlib
+import matplotlib.image
 import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-# Local field class, copy of model.py No idea how to import without circular importing this stuff
-class Field_loc:
-    # Field class represents a single field on the map
-    def __init__(self, x, y, elevation):
-        # Initialize the field's position and elevation
-        self.x = x
-        self.y = y
-        self.elevation = elevation
-
-    def __repr__(self):
-        # Return a string representation of the field
-        return f'Field(x={self.x}, y={self.y}, elevation={self.elevation})'
-
-    def __eq__(self, other):
-        # Return True if the fields are equal, False otherwise
-        return self.x == other.x and self.y == other.y and self.elevation == other.elevation
-
-def plot_path(path_data, y_size, x_size):
-    # Creating a white matrix
-    grid = np.ones((y_size, x_size, 3))  # Initialize with white color (RGB: 1, 1, 1)
-
-    count = 0
-
-    # Plotting the path on the grid
-    for field in path_data:
-        # Convert path coordinates to matrix indices
-        grid_y = field.y  # Reverse y-axis to match Matplotlib's coordinate system
-        grid_x = field.x
-
-        # Assign color based on elevation
-        color = plt.cm.RdYlGn(field.elevation / 25)  # Convert elevation to a color in the RdYlGn colormap
-        
-
-        # Fill the corresponding field in the grid with the color
-        grid[grid_y, grid_x] = color[:3]  # Keep only RGB channels
-        
-        # Annotate the cell with the count number
-        plt.text(x=grid_x, y=grid_y, s=str(count))
-        count += 1  # Increment the count
-
-    # Display the grid as an image
-    plt.imshow(grid, interpolation='nearest', aspect='auto')
-
-    # Adding labels and title
-    plt.xlabel('X')
-    plt.ylabel('Y')
-    plt.title(f'Colored Path on Grid, used {count} steps')
-
-    # Show the plot
+from .model import Map, Field, DistanceField
+
+# paths with more steps only get every n-th step numbered
+MAX_ANNOTATIONS = 50
+# colours of fields that can not reach the target and of expanded fields
+UNREACHABLE_COLOR = (0.5, 0.5, 0.5)
+EXPANDED_COLOR = (1.0, 0.5, 0.0)
+
+def render_path(path_data, y_size, x_size, elevations=None):
+    # Build the RGB image (y_size, x_size, 3) of a path in one vectorised pass
+    # path fields are coloured by their elevation in the RdYlGn colormap, the other fields are white,
+    # or if the elevations of the map are given (y_size, x_size), coloured like the path but faded
+    colormap = matplotlib.colormaps['RdYlGn']
+    if elevations is None:
+        grid = np.ones((y_size, x_size, 3))
+    else:
+        grid = 0.5 + 0.5 * colormap(np.asarray(elevations) / 25)[:, :, :3]
+    if path_data:
+        xs = np.fromiter((field.x for field in path_data), dtype=np.intp, count=len(path_data))
+        ys = np.fromiter((field.y for field in path_data), dtype=np.intp, count=len(path_data))
+        levels = np.fromiter((field.elevation for field in path_data), dtype=float, count=len(path_data))
+        grid[ys, xs] = colormap(levels / 25)[:, :3]
+    return grid
+
+
+def get_annotated_steps(length, max_annotations=MAX_ANNOTATIONS):
+    # Get the numbers of the steps to annotate, every step up to max_annotations steps,
+    # above only every n-th step and the last one
+    if length <= max_annotations:
+        return range(length)
+    every = -(-length // max_annotations)
+    return [*range(0, length - 1, every), length - 1]
+
+
+def draw_path(axes, path_data, grid, max_annotations=MAX_ANNOTATIONS):
+    # Draw the image of a path with its step numbers and labels on the given axes
+    for count in get_annotated_steps(len(path_data), max_annotations):
+        axes.text(x=path_data[count].x, y=path_data[count].y, s=str(count))
+    axes.imshow(grid, interpolation='nearest', aspect='auto')
+    axes.set_xlabel('X')
+    axes.set_ylabel('Y')
+    axes.set_title(f'Colored Path on Grid, used {len(path_data)} steps')
+
+
+def plot_path(path_data, y_size, x_size, file_name=None, elevations=None, max_annotations=MAX_ANNOTATIONS):
+    # Plot a path on a grid of y_size x x_size fields, see render_path for the colours
+    # the steps are numbered, for long paths only every n-th step (see get_annotated_steps)
+    # with file_name the plot is written as PNG without any window or interactive backend,
+    # otherwise it is shown with pyplot
+    grid = render_path(path_data, y_size, x_size, elevations)
+    if file_name is not None:
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        draw_path(figure.add_subplot(), path_data, grid, max_annotations)
+        figure.savefig(file_name, format='png')
+        return
+    import matplotlib.pyplot as plt
+    draw_path(plt.gca(), path_data, grid, max_annotations)
     plt.show()
 
-if __name__ == '__main__':
-    # Grid dimensions
-    x_size = 6
-    y_size = 5
 
-    # Example path data: list of Field objects
+def save_image(file_name, grid):
+    # Write an image as PNG with one pixel per field, without a figure, for maps too large to plot
+    matplotlib.image.imsave(file_name, grid, format='png')
+
+def get_distance_grid(map: Map, distances):
+    # Get the distances of a DistanceField, a wavefront search or any flat array indexed by
+    # y * width + x as (height, width) array, -1 marks unreachable fields
+    if isinstance(distances, DistanceField):
+        distances = distances.distances
+    return np.asarray(distances, dtype=np.int64).reshape(map.height, map.width)
+
+
+def get_expanded_grid(map: Map, expanded):
+    # Get the expanded fields as (height, width) boolean mask, expanded can be a mask already
+    # or an iterable of the expanded fields, e.g. collected with the on_expand hook of a solve
+    if isinstance(expanded, np.ndarray):
+        return expanded.astype(bool).reshape(map.height, map.width)
+    indices = np.fromiter((field.y * map.width + field.x for field in expanded), dtype=np.intp)
+    mask = np.zeros(map.width * map.height, dtype=bool)
+    mask[indices] = True
+    return mask.reshape(map.height, map.width)
+
+
+def render_search(map: Map, distances=None, expanded=None, file_name=None):
+    # Build the RGB images (height, width, 3) of a search in one vectorised pass each:
+    # the heatmap of the distances (viridis, unreachable fields gray) and the expanded fields
+    # over the faded elevations of the map; images that are not asked for are None
+    # with file_name both are written side by side into a PNG without an interactive backend
+    heatmap = None
+    coverage = None
+    titles = []
+    if distances is not None:
+        grid = get_distance_grid(map, distances)
+        reachable = grid >= 0
+        longest = max(int(grid.max()), 1)
+        heatmap = matplotlib.colormaps['viridis'](np.where(reachable, grid, 0) / longest)[:, :, :3]
+        heatmap[~reachable] = UNREACHABLE_COLOR
+        titles.append((f'Distances, longest {int(grid.max())} steps', heatmap))
+    if expanded is not None:
+        mask = get_expanded_grid(map, expanded)
+        coverage = 0.5 + 0.5 * matplotlib.colormaps['RdYlGn'](map.get_elevation_grid() / 25)[:, :, :3]
+        coverage[mask] = EXPANDED_COLOR
+        titles.append((f'Expanded fields: {int(np.count_nonzero(mask))}', coverage))
+    if file_name is not None:
+        figure = Figure(figsize=(6.4 * max(len(titles), 1), 4.8))
+        FigureCanvasAgg(figure)
+        for number, (title, image) in enumerate(titles):
+            axes = figure.add_subplot(1, len(titles), number + 1)
+            axes.imshow(image, interpolation='nearest', aspect='auto')
+            axes.set_xlabel('X')
+            axes.set_ylabel('Y')
+            axes.set_title(title)
+        figure.savefig(file_name, format='png')
+    return heatmap, coverage
+
+
+if __name__ == '__main__':
+    # Example path data: list of Field objects on a grid of 6x5 fields
     path_data = [
-        Field_loc(0, 0, 0),
-        Field_loc(1, 1, 5),
-        Field_loc(2, 2, 10),
-        Field_loc(3, 2, 15),
-        Field_loc(4, 3, 20),
-        Field_loc(5, 3, 22),
-        Field_loc(5, 4, 25)
+        Field(0, 0, 0),
+        Field(1, 1, 5),
+        Field(2, 2, 10),
+        Field(3, 2, 15),
+        Field(4, 3, 20),
+        Field(5, 3, 22),
+        Field(5, 4, 25)
     ]
-    plot_path(path_data, y_size, x_size)
\ No newline at end of file
+    plot_path(path_data, 5, 6)
@@ -0,0 +1,105 @@
+import time
+
+import numpy as np
+
+from .model import Map, Field, Path, SearchStats
+
+
+def search(map: Map, start: Field, end: Field, masks=None, stats: SearchStats = None, on_expand=None):
+    # Advance the whole wavefront from start one step per iteration until end is reached
+    # returns the array of steps from start to every reached field (-1: not reached) and the
+    # number of steps to end, None if it can not be reached
+    # on_expand(field) is called for start and after every step for the fields it reached
+    if masks is None:
+        masks = map.get_masks()
+    north, south, west, east = masks
+    distances = np.full((map.height, map.width), -1, dtype=np.int64)
+    visited = np.zeros((map.height, map.width), dtype=bool)
+    frontier = np.zeros((map.height, map.width), dtype=bool)
+    frontier[start.y, start.x] = True
+    visited[start.y, start.x] = True
+    distances[start.y, start.x] = 0
+    if on_expand is not None:
+        on_expand(map.get_field(start.x, start.y))
+    steps = 0
+    peak = 1
+    # bounds (top, bottom, left, right, inclusive) of the frontier, each step only works on
+    # the window one field around it, which keeps narrow wavefronts on large maps cheap
+    top, bottom, left, right = start.y, start.y, start.x, start.x
+    while not visited[end.y, end.x]:
+        top, left = max(top - 1, 0), max(left - 1, 0)
+        bottom, right = min(bottom + 1, map.height - 1), min(right + 1, map.width - 1)
+        window = (slice(top, bottom + 1), slice(left, right + 1))
+        current = frontier[window]
+        reached = np.zeros_like(current)
+        reached[:-1, :] |= current[1:, :] & north[window][1:, :]
+        reached[1:, :] |= current[:-1, :] & south[window][:-1, :]
+        reached[:, :-1] |= current[:, 1:] & west[window][:, 1:]
+        reached[:, 1:] |= current[:, :-1] & east[window][:, :-1]
+        reached &= ~visited[window]
+        rows = np.flatnonzero(reached.any(axis=1))
+        if not len(rows):
+            break
+        columns = np.flatnonzero(reached.any(axis=0))
+        steps += 1
+        peak = max(peak, int(np.count_nonzero(reached)))
+        distances[window][reached] = steps
+        visited[window] |= reached
+        frontier[window] = reached
+        if on_expand is not None:
+            for y, x in np.argwhere(reached):
+                on_expand(map.get_field(left + int(x), top + int(y)))
+        top, bottom = top + int(rows[0]), top + int(rows[-1])
+        left, right = left + int(columns[0]), left + int(columns[-1])
+    if stats is not None:
+        stats.expanded = stats.expanded_forward = int(np.count_nonzero(visited))
+        stats.peak_frontier = peak
+    if not visited[end.y, end.x]:
+        return distances, None
+    return distances, steps
+
+
+def count_steps(map: Map, start: Field = None, end: Field = None):
+    # Get the number of steps of a shortest path from start (default: start of the map)
+    # to end (default: end of the map), None if it is unreachable
+    return search(map, map.start if start is None else start, map.end if end is None else end)[1]
+
+
+def reconstruct(map: Map, distances, masks, end: Field) -> list:
+    # Walk back from end to the field with distance 0, always to a neighbour one step closer
+    # from which end can be climbed, returns the fields from the start to end
+    north, south, west, east = masks
+    x, y = end.x, end.y
+    fields = [map.get_field(x, y)]
+    # neighbour offset and the mask of the step from that neighbour back to the current field
+    moves = ((0, -1, south), (0, 1, north), (-1, 0, east), (1, 0, west))
+    while distances[y, x] > 0:
+        for dx, dy, mask in moves:
+            nx, ny = x + dx, y + dy
+            if map.is_on_map(nx, ny) and distances[ny, nx] == distances[y, x] - 1 and mask[ny, nx]:
+                x, y = nx, ny
+                break
+        fields.append(map.get_field(x, y))
+    fields.reverse()
+    return fields
+
+
+def solve(map: Map, path: Path, start: Field, stats: SearchStats = None, on_expand=None) -> Path:
+    # Solve the map from start to the end of the map with the wavefront search and append the
+    # steps to a copy of the given path, None if the end is unreachable
+    # on_expand(field) is called for every reached field, step by step
+    if stats is None:
+        stats = SearchStats("wavefront")
+    started = time.perf_counter()
+    masks = map.get_masks()
+    stats.index_seconds += time.perf_counter() - started
+    distances, steps = search(map, start, map.end, masks, stats, on_expand)
+    if steps is None:
+        return None
+    started = time.perf_counter()
+    fields = reconstruct(map, distances, masks, map.end)
+    result = Path()
+    previous = path.fields
+    result.fields = previous[:-1] + fields if previous else fields
+    stats.reconstruct_seconds += time.perf_counter() - started
+    return result
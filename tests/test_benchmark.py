@@ -0,0 +1,39 @@
+import json
+from benchmarks.benchmark import main, run, generate_map, find_regressions
+
+def test_running_the_benchmark_on_the_example(tmp_path):
+    # GIVEN the size of the example map only
+    report_file = tmp_path / "report.json"
+    # WHEN running the benchmark script
+    assert main(["--max-size", "40", "--output", str(report_file)]) == 0
+    # THEN the report should contain every benchmark with time, expansions and memory
+    records = json.loads(report_file.read_text())
+    names = [entry["benchmark"] for entry in records]
+    assert names == ["from_string", "from_string_compact", "get_neighbours", "get_adjacency",
+                     "solve_bfs", "solve_astar", "solve_bidirectional", "solve_wavefront", "solve_dfs",
+                     "distance_field"]
+    for entry in records:
+        assert (entry["width"], entry["height"]) == (8, 5)
+        assert entry["seconds"] >= 0
+        assert entry["peak_bytes"] > 0
+    assert all(entry["expanded"] > 0 for entry in records if entry["benchmark"].startswith("solve_"))
+
+def test_generated_map_has_the_requested_size():
+    # GIVEN a size for a generated map
+    # WHEN generating it
+    rows = generate_map(30, 4).splitlines()
+    # THEN it should have the requested size with start and end in opposite corners
+    assert len(rows) == 4
+    assert all(len(row) == 30 for row in rows)
+    assert rows[0][0] == 'S'
+    assert rows[3][29] == 'E'
+
+def test_finding_regressions():
+    # GIVEN a report and a baseline where one benchmark was twice as fast
+    records = run(sizes=[(8, 5)], engines=["bfs"], memory=False)
+    baseline = [dict(entry) for entry in records]
+    baseline[0]["seconds"] = records[0]["seconds"] / 2
+    # WHEN comparing the report with the baseline
+    regressions = find_regressions(records, baseline, tolerance=1.5)
+    # THEN only that benchmark should be reported
+    assert regressions == [records[0]]
@@ -0,0 +1,95 @@
+import pytest
+from src.model import Map, Field, Walker, Path, ShortestPathFinder
+from src.binary import BinaryMap, HEADER, is_binary_map, main
+
+SMALL_TEST_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_written_map_can_be_read_back(tmp_path, compact):
+    # GIVEN a map written into a binary map file
+    expected = Map.from_string(SMALL_TEST_MAP, compact=compact)
+    BinaryMap.write(expected, str(tmp_path / "map.hmap"))
+    # WHEN opening the file
+    world = BinaryMap.from_file(str(tmp_path / "map.hmap"))
+    # THEN it should contain the same fields, start and end behind a small header
+    assert (tmp_path / "map.hmap").stat().st_size == HEADER.size + 40
+    assert (world.width, world.height) == (8, 5)
+    assert world.get_elevations() == expected.get_elevations()
+    assert world.start == expected.start
+    assert world.end == expected.end
+    assert world.get_content_hash() == expected.get_content_hash()
+    world.close()
+
+def test_solving_a_binary_map(tmp_path):
+    # GIVEN a binary map file
+    BinaryMap.write(Map.from_string(SMALL_TEST_MAP), str(tmp_path / "map.hmap"))
+    world = BinaryMap.from_file(str(tmp_path / "map.hmap"))
+    walker = Walker(world)
+    # WHEN solving it
+    shortest = ShortestPathFinder.solve(world, Path(walker), walker)
+    # THEN the path should be the 31 steps of the puzzle
+    assert shortest.get_length() == 32
+    assert shortest.get_end() == Field(5, 2, 25)
+    world.close()
+
+def test_changes_stay_in_memory(tmp_path):
+    # GIVEN an opened binary map file
+    BinaryMap.write(Map.from_string(SMALL_TEST_MAP), str(tmp_path / "map.hmap"))
+    world = BinaryMap(str(tmp_path / "map.hmap"))
+    # WHEN changing a field
+    world.add_field(1, 0, 7)
+    # THEN the map should change, but not the file
+    assert world.get_field(1, 0) == Field(1, 0, 7)
+    reopened = BinaryMap(str(tmp_path / "map.hmap"))
+    assert reopened.get_field(1, 0) == Field(1, 0, 0)
+    world.close()
+    reopened.close()
+
+def test_map_without_start_and_end(tmp_path):
+    # GIVEN a map without start and end
+    BinaryMap.write(Map.from_string("abc\ncba"), str(tmp_path / "map.hmap"))
+    # WHEN opening it
+    world = BinaryMap(str(tmp_path / "map.hmap"))
+    # THEN it should have neither
+    assert not hasattr(world, "start")
+    assert not hasattr(world, "end")
+    world.close()
+
+def test_converting_a_text_map(tmp_path):
+    # GIVEN a text map file
+    (tmp_path / "map.txt").write_text(SMALL_TEST_MAP)
+    # WHEN converting it with the command
+    assert main([str(tmp_path / "map.txt"), str(tmp_path / "map.hmap")]) == 0
+    # THEN only the binary file should be detected as binary map
+    assert is_binary_map(str(tmp_path / "map.hmap"))
+    assert not is_binary_map(str(tmp_path / "map.txt"))
+
+@pytest.mark.parametrize("content, message", [
+    (b"Sabc", "is not a binary map file!"),
+    (HEADER.pack(b'HMAP', 8, 5, 0, 0, 1, 1) + bytes(39), "is too short!"),
+    (HEADER.pack(b'HMAP', 3, 2, 5, 0, 1, 1) + bytes(6), "Field (5, 0) is not on the map!"),
+    (HEADER.pack(b'HMAP', 3, 2, 0, 0, -1, 1) + bytes(6), "Field (-1, 1) is not on the map!"),
+])
+def test_invalid_binary_map_file(tmp_path, content, message):
+    # GIVEN a file which is not a complete binary map
+    (tmp_path / "map.hmap").write_bytes(content)
+    # WHEN opening it
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        BinaryMap(str(tmp_path / "map.hmap"))
+    assert str(excinfo.value).endswith(message)
+
+def test_elevations_have_to_fit_in_a_byte(tmp_path):
+    # GIVEN a map with an elevation above 255
+    world = Map.from_string("ab")
+    world.add_field(1, 0, 300)
+    # WHEN writing it
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        BinaryMap.write(world, str(tmp_path / "map.hmap"))
+    assert str(excinfo.value) == "Elevations have to fit in 0..255!"
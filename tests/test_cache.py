@@ -0,0 +1,105 @@
+import pytest
+from src.model import Map, Field, ClimbingPolicy
+from src.cache import DistanceFieldCache
+
+SMALL_TEST_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+def test_repeated_query_is_a_hit():
+    # GIVEN a cache and a map
+    cache = DistanceFieldCache()
+    world = Map.from_string(SMALL_TEST_MAP)
+
+    # WHEN asking for the path twice
+    first = cache.get_path(world)
+    second = cache.get_path(world)
+
+    # THEN the first query should be a miss, the second one a hit with the same path
+    assert cache.misses == 1
+    assert cache.hits == 1
+    assert first.get_length() == second.get_length() == 32
+    assert second.fields[0] == world.start
+    assert second.get_end() == world.end
+
+def test_same_content_in_another_map_is_a_hit():
+    # GIVEN a cache filled from a dict backed map
+    cache = DistanceFieldCache()
+    cache.get_path(Map.from_string(SMALL_TEST_MAP))
+
+    # WHEN asking with a compact map parsed from the same string
+    compact = Map.from_string(SMALL_TEST_MAP, compact=True)
+    path = cache.get_path(compact, start=Field(0, 4, 0))
+
+    # THEN the answer should come from the cache
+    assert cache.hits == 1
+    assert path.fields[0] == Field(0, 4, 0)
+    assert path.get_end() == compact.end
+
+def test_changed_map_is_a_miss():
+    # GIVEN a cache filled from a map
+    cache = DistanceFieldCache()
+    world = Map.from_string(SMALL_TEST_MAP)
+    cache.get_path(world)
+
+    # WHEN changing a field and asking again
+    world.add_field(1, 0, 1)
+    cache.get_path(world)
+
+    # THEN the map should be solved again
+    assert cache.misses == 2
+    assert cache.hits == 0
+
+def test_changed_policy_is_a_miss():
+    # GIVEN a cache filled from a map
+    cache = DistanceFieldCache()
+    world = Map.from_string(SMALL_TEST_MAP)
+    first = cache.get_path(world)
+
+    # WHEN allowing to climb two levels and asking again
+    world.set_policy(ClimbingPolicy(max_climb=2))
+    second = cache.get_path(world)
+
+    # THEN the map should be solved again with a shorter path
+    assert cache.misses == 2
+    assert cache.hits == 0
+    assert second.get_length() < first.get_length()
+
+def test_least_recently_used_is_evicted():
+    # GIVEN a cache of size 2 holding the distance fields to two targets
+    cache = DistanceFieldCache(max_size=2)
+    world = Map.from_string(SMALL_TEST_MAP)
+    cache.get_distance_field(world, Field(0, 0, 0))
+    cache.get_distance_field(world, Field(1, 0, 0))
+
+    # WHEN using the first one again and adding a third target
+    cache.get_distance_field(world, Field(0, 0, 0))
+    cache.get_distance_field(world, Field(2, 0, 1))
+
+    # THEN the second target should have been evicted
+    assert len(cache) == 2
+    cache.get_distance_field(world, Field(0, 0, 0))
+    assert cache.hits == 2
+    cache.get_distance_field(world, Field(1, 0, 0))
+    assert cache.misses == 4
+
+def test_unreachable_start_gives_no_path():
+    # GIVEN a map where the corner can not be reached from the middle
+    world = Map.from_string("fbf\nbab\nfbf")
+    world.set_start(1, 1)
+    world.set_end(0, 0)
+
+    # WHEN asking the cache for the path
+    # THEN there should be none
+    assert DistanceFieldCache().get_path(world) is None
+
+def test_invalid_cache_size():
+    # GIVEN a cache size of 0
+    # WHEN creating the cache
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        DistanceFieldCache(max_size=0)
+    assert str(excinfo.value) == "Cache size must be at least 1!"
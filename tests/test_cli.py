@@ -0,0 +1,88 @@
+import io
+import sys
+import json
+import subprocess
+from src.cli import main
+from src.model import Map
+from src.binary import BinaryMap
+
+SMALL_TEST_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+def read_results(output):
+    # parse the JSON lines written by the command
+    return [json.loads(line) for line in output.splitlines()]
+
+def test_solving_files(tmp_path, capsys):
+    # GIVEN two map files
+    (tmp_path / "a.txt").write_text(SMALL_TEST_MAP)
+    (tmp_path / "b.txt").write_text("SbcE")
+    # WHEN solving them with astar
+    code = main([str(tmp_path / "a.txt"), str(tmp_path / "b.txt"), "--engine", "astar", "--stats"])
+    # THEN a JSON line per file should be written in the order of the files
+    results = read_results(capsys.readouterr().out)
+    assert code == 0
+    assert [(result["file"], result["steps"]) for result in results] == \
+        [(str(tmp_path / "a.txt"), 31), (str(tmp_path / "b.txt"), None)]
+    assert results[0]["stats"]["engine"] == "astar"
+
+def test_solving_stdin(monkeypatch, capsys):
+    # GIVEN a map on stdin
+    monkeypatch.setattr(sys, "stdin", io.StringIO(SMALL_TEST_MAP + "\n"))
+    # WHEN solving without files and with the path
+    code = main(["--path"])
+    # THEN the result should be written for "-"
+    result = read_results(capsys.readouterr().out)[0]
+    assert code == 0
+    assert result["file"] == "-"
+    assert result["steps"] == 31
+    assert result["path"][-1] == [5, 2]
+
+def test_solving_with_workers_and_errors(tmp_path, capsys):
+    # GIVEN a map file and a file that does not exist
+    (tmp_path / "a.txt").write_text(SMALL_TEST_MAP)
+    # WHEN solving them in worker processes
+    code = main([str(tmp_path / "a.txt"), str(tmp_path / "missing.txt"), "--workers", "2"])
+    # THEN the error should be reported and the exit code should be 1
+    results = {result["file"]: result for result in read_results(capsys.readouterr().out)}
+    assert code == 1
+    assert results[str(tmp_path / "a.txt")]["steps"] == 31
+    assert "error" in results[str(tmp_path / "missing.txt")]
+
+def test_solving_binary_maps_with_workers(tmp_path, capsys):
+    # GIVEN a text and a binary map file
+    (tmp_path / "a.txt").write_text(SMALL_TEST_MAP)
+    BinaryMap.write(Map.from_string(SMALL_TEST_MAP), str(tmp_path / "a.hmap"))
+    # WHEN solving them in worker processes
+    code = main([str(tmp_path / "a.txt"), str(tmp_path / "a.hmap"), "--workers", "2"])
+    # THEN both should be solved
+    results = {result["file"]: result for result in read_results(capsys.readouterr().out)}
+    assert code == 0
+    assert results[str(tmp_path / "a.txt")]["steps"] == 31
+    assert results[str(tmp_path / "a.hmap")]["steps"] == 31
+
+def test_matplotlib_is_only_imported_for_plots(tmp_path):
+    # GIVEN a map file
+    (tmp_path / "a.txt").write_text(SMALL_TEST_MAP)
+    # WHEN solving it in a fresh interpreter without plotting
+    script = ("import sys; from src.cli import main; main([sys.argv[1]]); "
+              "print('matplotlib' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", script, str(tmp_path / "a.txt")],
+                            capture_output=True, text=True, check=True).stdout
+    # THEN matplotlib should not have been imported
+    assert output.splitlines() == ['{"file": "%s", "steps": 31}' % (tmp_path / "a.txt"), "False"]
+
+def test_writing_plots_without_a_display(tmp_path, capsys):
+    # GIVEN a map file
+    (tmp_path / "a.txt").write_text(SMALL_TEST_MAP)
+    # WHEN solving it with a plot directory
+    code = main([str(tmp_path / "a.txt"), "--plot-dir", str(tmp_path / "plots")])
+    # THEN a PNG of the path should be written and named in the result
+    result = read_results(capsys.readouterr().out)[0]
+    assert code == 0
+    assert result["plot"] == str(tmp_path / "plots" / "a.txt.png")
+    assert (tmp_path / "plots" / "a.txt.png").read_bytes().startswith(b"\x89PNG")
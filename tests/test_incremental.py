@@ -0,0 +1,80 @@
+import random
+from src.model import Map, Field, Walker, Path, ShortestPathFinder
+from src.incremental import IncrementalPlanner
+
+def solve_length(world):
+    # length of the path found by a fresh BFS, None if unreachable
+    walker = Walker(world)
+    shortest = ShortestPathFinder.solve(world, Path(walker), walker)
+    return None if shortest is None else shortest.get_length()
+
+def test_planning_the_small_test_map():
+    # GIVEN the small test map
+    world = Map.from_string("""\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi""")
+    # WHEN planning the path
+    path = IncrementalPlanner(world).get_path()
+    # THEN it should be 31 steps long
+    assert path.get_length() == 32
+    assert path.fields[0] == world.start
+    assert path.get_end() == Field(5, 2, 25)
+
+def test_replanning_after_a_small_change_expands_less():
+    # GIVEN a planned path over a large flat map with a wall that has to be walked around
+    rows = ["a" * 30 + "z" + "a" * 29 for _ in range(59)] + ["a" * 60]
+    world = Map.from_string("\n".join(rows), compact=True)
+    world.set_start(0, 0)
+    world.set_end(59, 0)
+    planner = IncrementalPlanner(world)
+    blocked = planner.get_path().fields[2]
+    first_expanded = planner.expanded
+
+    # WHEN raising a field on the path, so it has to be walked around
+    planner.change_fields([(blocked.x, blocked.y, 5)])
+    path = planner.get_path()
+
+    # THEN the new path should be as long as a freshly solved one and avoid the field
+    assert path.get_length() == solve_length(world) == 178
+    assert world.get_field(blocked.x, blocked.y) not in path.fields
+    # AND the repair should expand far fewer fields than the first search
+    assert planner.expanded * 10 < first_expanded
+
+def test_replanning_when_the_end_becomes_reachable_and_unreachable_again():
+    # GIVEN a map where the end can not be reached
+    world = Map.from_string("Sab\nzzE")
+    planner = IncrementalPlanner(world)
+    assert planner.get_path() is None
+    # WHEN building a staircase to the end
+    planner.change_fields([(1, 0, 1), (2, 0, 2), (2, 1, 3)])
+    path = planner.get_path()
+    # THEN the end should be reachable
+    assert path.fields == [Field(0, 0, 0), Field(1, 0, 1), Field(2, 0, 2), Field(2, 1, 3)]
+    # WHEN raising the last step again
+    planner.change_fields([(2, 0, 24)])
+    # THEN the end should be unreachable again
+    assert planner.get_path() is None
+
+def test_replanning_random_changes_matches_solving():
+    # GIVEN random maps with random batches of changes
+    generator = random.Random(12)
+    for _ in range(100):
+        width = generator.randint(1, 8)
+        height = generator.randint(1, 8)
+        world = Map.from_string("\n".join(
+            "".join(generator.choice("abcd") for _ in range(width)) for _ in range(height)))
+        world.set_start(generator.randrange(width), generator.randrange(height))
+        world.set_end(generator.randrange(width), generator.randrange(height))
+        planner = IncrementalPlanner(world)
+        for _ in range(4):
+            # WHEN replanning after every batch
+            path = planner.get_path()
+            # THEN the path should be as long as a freshly solved one
+            assert (None if path is None else path.get_length()) == solve_length(world)
+            planner.change_fields([(generator.randrange(width), generator.randrange(height), generator.randrange(5))
+                                   for _ in range(generator.randint(1, 3))])
+            world.set_start(world.start.x, world.start.y)
+            world.set_end(world.end.x, world.end.y)
@@ -1,7 +1,55 @@
 
 import pytest
+import pickle
+import random
 import sys
-from src.model import Map, Field, Walker, Path, ShortestPathFinder, get_elevation_from_char
+import tracemalloc
+from src.model import Map, CompactMap, Field, Walker, Path, ShortestPathFinder, get_elevation_from_char
+from src.model import ClimbingPolicy, DEFAULT_POLICY, Adjacency
+
+# puzzle input used by the large solving tests
+FULL_TEST_MAP = """\
+abacccaaaacccccccccccaaaaaacccccaaaaaaccccaaacccccccccccccccccccccccccccccccccccccccccccaaaaa
+abaaccaaaacccccccccccaaaaaaccccccaaaaaaaaaaaaaccccccccccccccccccccccccccccccccccccccccccaaaaa
+abaaccaaaacccccccccccaaaaacccccaaaaaaaaaaaaaaaccccccccccccccccccccccccccccccccccccccccccaaaaa
+abccccccccccccccccccccaaaaacccaaaaaaaaaaaaaaaacccccccccccccccccccccccccccaaaccccccccccccaaaaa
+abccccccccccccccccccccaacaacccaaaaaaaaccaaaaaccccccccccccccccccccccccccccaaaccccccccccccaccaa
+abcccccccccccccaacccaaaccccccaaaaaaaaaccaaaaaccccccccccccccccccccccccccccccacccccccccccccccca
+abcccccccccccaaaaaaccaaaccacccccaaaaaaacccccccccccccccccccccccccciiiicccccccddddddccccccccccc
+abcccccccccccaaaaaaccaaaaaaaccccaaaaaacccccaacccccccaaaccccccccciiiiiiiicccdddddddddacaaccccc
+abccccccccccccaaaaaaaaaaaaacccccaaaaaaacaaaacccccccaaaacccccccchhiiiiiiiiicddddddddddaaaccccc
+abcccccccccccaaaaaaaaaaaaaacccccccaaacccaaaaaacccccaaaaccccccchhhipppppiiiijjjjjjjddddaaccccc
+abcccccccccccaaaaaaaaaaaaaaccccccccccccccaaaaaccccccaaaccccccchhhpppppppiijjjjjjjjjddeeaccccc
+abcccccccccccccccccaaaaaaaacccccccccccccaaaaaccccccccccccccccchhppppppppppjjqqqjjjjjeeeaacccc
+abccccccccccccccccccaaaaaaaacccccccccccccccaacccccccccccccccchhhpppuuuupppqqqqqqqjjjeeeaacccc
+abcccccccccccccccccccaacccacccccccccccccccccccccccccccccccccchhhopuuuuuuppqqqqqqqjjjeeecccccc
+abacccccccccccccaaacaaaccccccccccccccccccccccccccccaaccccccchhhhoouuuuuuuqvvvvvqqqjkeeecccccc
+abaccccccccccccaaaaaacccccaaccccccccccccccccccccccaaaccccccchhhooouuuxxxuvvvvvvqqqkkeeecccccc
+abaccccccccccccaaaaaacccaaaaaaccccccccccccccccccaaaaaaaaccchhhhooouuxxxxuvyyyvvqqqkkeeecccccc
+abcccccccccccccaaaaacccaaaaaaaccccccccccccccccccaaaaaaaaccjjhooooouuxxxxyyyyyvvqqqkkeeecccccc
+abccccccccccccccaaaaaacaaaaaaaccccccccaaaccccccccaaaaaaccjjjooootuuuxxxxyyyyyvvqqkkkeeecccccc
+abccccccccccccccaaaaaaaaaaaaacccccccccaaaacccccccaaaaaacjjjooootttuxxxxxyyyyvvrrrkkkeeecccccc
+SbccccccccccccccccccaaaaaaaaacccccccccaaaacccccccaaaaaacjjjoootttxxxEzzzzyyvvvrrrkkkfffcccccc
+abcccccccccccaaacccccaaaaaaacaaaccccccaaaccccccccaaccaacjjjoootttxxxxxyyyyyyvvvrrkkkfffcccccc
+abcccccccccaaaaaacccaaaaaacccaaacacccaacccccccccccccccccjjjoootttxxxxyxyyyyyywvvrrkkkfffccccc
+abcccccccccaaaaaacccaaaaaaaaaaaaaaaccaaacaaacccccaacccccjjjnnnttttxxxxyyyyyyywwwrrkkkfffccccc
+abcaacacccccaaaaacccaaacaaaaaaaaaaaccaaaaaaacccccaacaaacjjjnnnntttttxxyywwwwwwwwrrrlkfffccccc
+abcaaaaccccaaaaacccccccccaacaaaaaaccccaaaaaacccccaaaaacccjjjnnnnnttttwwywwwwwwwrrrrllfffccccc
+abaaaaaccccaaaaaccccccaaaaaccaaaaacaaaaaaaaccccaaaaaaccccjjjjinnnntttwwwwwsssrrrrrllllffccccc
+abaaaaaaccccccccccccccaaaaacaaaaaacaaaaaaaaacccaaaaaaacccciiiiinnnntswwwwssssrrrrrlllfffccccc
+abacaaaaccccccccccccccaaaaaacaaccccaaaaaaaaaaccccaaaaaaccccciiiinnnssswwsssssllllllllfffccccc
+abccaaccccccccccccccccaaaaaaccccccccccaaacaaaccccaaccaacccccciiiinnsssssssmmllllllllfffaacccc
+abccccccccccccccccccccaaaaaaccccccccccaaaccccccccaaccccccccccciiinnmsssssmmmmlllllgggffaacccc
+abcccccccccccccccaccccccaaacccccccccccaaccccccccccccccccccccccciiimmmsssmmmmmgggggggggaaacccc
+abcccccccccaaaaaaaaccccccccccccccccccccccccccccaaaaaccccccccccciiimmmmmmmmmgggggggggaaacccccc
+abccccccccccaaaaaaccccccccccccccccccaacccccccccaaaaacccccccccccciiimmmmmmmhhggggcaaaaaaaccccc
+abccccccccccaaaaaacccccccccccccccccaacccccccccaaaaaacccccccccccciihhmmmmhhhhgccccccccaacccccc
+abccccaacaaaaaaaaaaccccccccccccccccaaaccccccccaaaaaaccccccccccccchhhhhhhhhhhaaccccccccccccccc
+abccccaaaaaaaaaaaaaaccccccccccaaccaaaaccccccccaaaaaacccaaacccccccchhhhhhhhaaaaccccccccccccccc
+abcccaaaaaaaaaaaaaaaccccccccaaaaaacaaaacacaccccaaaccccaaaacccccccccchhhhccccaaccccccccccaaaca
+abcccaaaaaacacaaacccccccccccaaaaaaaaaaaaaaacccccccccccaaaacccccccccccaaaccccccccccccccccaaaaa
+abcccccaaaacccaaaccccccccccaaaaaaaaaaaaaaaaccccccccccccaaacccccccccccaaacccccccccccccccccaaaa
+abcccccaacccccaacccccccccccaaaaaaaaaaaaaccccccccccccccccccccccccccccccccccccccccccccccccaaaaa"""
 
 #############################
 #
@@ -221,62 +269,584 @@ abdefghi"""
     assert shortest.get_end() == Field(5, 2, 25)
 
 
-@pytest.mark.skip(reason="Data too big")
 def test_solving_full_test_map_():
 
     # GIVEN a mutli line string with a full map 
-    map_string = """\
-abacccaaaacccccccccccaaaaaacccccaaaaaaccccaaacccccccccccccccccccccccccccccccccccccccccccaaaaa
-abaaccaaaacccccccccccaaaaaaccccccaaaaaaaaaaaaaccccccccccccccccccccccccccccccccccccccccccaaaaa
-abaaccaaaacccccccccccaaaaacccccaaaaaaaaaaaaaaaccccccccccccccccccccccccccccccccccccccccccaaaaa
-abccccccccccccccccccccaaaaacccaaaaaaaaaaaaaaaacccccccccccccccccccccccccccaaaccccccccccccaaaaa
-abccccccccccccccccccccaacaacccaaaaaaaaccaaaaaccccccccccccccccccccccccccccaaaccccccccccccaccaa
-abcccccccccccccaacccaaaccccccaaaaaaaaaccaaaaaccccccccccccccccccccccccccccccacccccccccccccccca
-abcccccccccccaaaaaaccaaaccacccccaaaaaaacccccccccccccccccccccccccciiiicccccccddddddccccccccccc
-abcccccccccccaaaaaaccaaaaaaaccccaaaaaacccccaacccccccaaaccccccccciiiiiiiicccdddddddddacaaccccc
-abccccccccccccaaaaaaaaaaaaacccccaaaaaaacaaaacccccccaaaacccccccchhiiiiiiiiicddddddddddaaaccccc
-abcccccccccccaaaaaaaaaaaaaacccccccaaacccaaaaaacccccaaaaccccccchhhipppppiiiijjjjjjjddddaaccccc
-abcccccccccccaaaaaaaaaaaaaaccccccccccccccaaaaaccccccaaaccccccchhhpppppppiijjjjjjjjjddeeaccccc
-abcccccccccccccccccaaaaaaaacccccccccccccaaaaaccccccccccccccccchhppppppppppjjqqqjjjjjeeeaacccc
-abccccccccccccccccccaaaaaaaacccccccccccccccaacccccccccccccccchhhpppuuuupppqqqqqqqjjjeeeaacccc
-abcccccccccccccccccccaacccacccccccccccccccccccccccccccccccccchhhopuuuuuuppqqqqqqqjjjeeecccccc
-abacccccccccccccaaacaaaccccccccccccccccccccccccccccaaccccccchhhhoouuuuuuuqvvvvvqqqjkeeecccccc
-abaccccccccccccaaaaaacccccaaccccccccccccccccccccccaaaccccccchhhooouuuxxxuvvvvvvqqqkkeeecccccc
-abaccccccccccccaaaaaacccaaaaaaccccccccccccccccccaaaaaaaaccchhhhooouuxxxxuvyyyvvqqqkkeeecccccc
-abcccccccccccccaaaaacccaaaaaaaccccccccccccccccccaaaaaaaaccjjhooooouuxxxxyyyyyvvqqqkkeeecccccc
-abccccccccccccccaaaaaacaaaaaaaccccccccaaaccccccccaaaaaaccjjjooootuuuxxxxyyyyyvvqqkkkeeecccccc
-abccccccccccccccaaaaaaaaaaaaacccccccccaaaacccccccaaaaaacjjjooootttuxxxxxyyyyvvrrrkkkeeecccccc
-SbccccccccccccccccccaaaaaaaaacccccccccaaaacccccccaaaaaacjjjoootttxxxEzzzzyyvvvrrrkkkfffcccccc
-abcccccccccccaaacccccaaaaaaacaaaccccccaaaccccccccaaccaacjjjoootttxxxxxyyyyyyvvvrrkkkfffcccccc
-abcccccccccaaaaaacccaaaaaacccaaacacccaacccccccccccccccccjjjoootttxxxxyxyyyyyywvvrrkkkfffccccc
-abcccccccccaaaaaacccaaaaaaaaaaaaaaaccaaacaaacccccaacccccjjjnnnttttxxxxyyyyyyywwwrrkkkfffccccc
-abcaacacccccaaaaacccaaacaaaaaaaaaaaccaaaaaaacccccaacaaacjjjnnnntttttxxyywwwwwwwwrrrlkfffccccc
-abcaaaaccccaaaaacccccccccaacaaaaaaccccaaaaaacccccaaaaacccjjjnnnnnttttwwywwwwwwwrrrrllfffccccc
-abaaaaaccccaaaaaccccccaaaaaccaaaaacaaaaaaaaccccaaaaaaccccjjjjinnnntttwwwwwsssrrrrrllllffccccc
-abaaaaaaccccccccccccccaaaaacaaaaaacaaaaaaaaacccaaaaaaacccciiiiinnnntswwwwssssrrrrrlllfffccccc
-abacaaaaccccccccccccccaaaaaacaaccccaaaaaaaaaaccccaaaaaaccccciiiinnnssswwsssssllllllllfffccccc
-abccaaccccccccccccccccaaaaaaccccccccccaaacaaaccccaaccaacccccciiiinnsssssssmmllllllllfffaacccc
-abccccccccccccccccccccaaaaaaccccccccccaaaccccccccaaccccccccccciiinnmsssssmmmmlllllgggffaacccc
-abcccccccccccccccaccccccaaacccccccccccaaccccccccccccccccccccccciiimmmsssmmmmmgggggggggaaacccc
-abcccccccccaaaaaaaaccccccccccccccccccccccccccccaaaaaccccccccccciiimmmmmmmmmgggggggggaaacccccc
-abccccccccccaaaaaaccccccccccccccccccaacccccccccaaaaacccccccccccciiimmmmmmmhhggggcaaaaaaaccccc
-abccccccccccaaaaaacccccccccccccccccaacccccccccaaaaaacccccccccccciihhmmmmhhhhgccccccccaacccccc
-abccccaacaaaaaaaaaaccccccccccccccccaaaccccccccaaaaaaccccccccccccchhhhhhhhhhhaaccccccccccccccc
-abccccaaaaaaaaaaaaaaccccccccccaaccaaaaccccccccaaaaaacccaaacccccccchhhhhhhhaaaaccccccccccccccc
-abcccaaaaaaaaaaaaaaaccccccccaaaaaacaaaacacaccccaaaccccaaaacccccccccchhhhccccaaccccccccccaaaca
-abcccaaaaaacacaaacccccccccccaaaaaaaaaaaaaaacccccccccccaaaacccccccccccaaaccccccccccccccccaaaaa
-abcccccaaaacccaaaccccccccccaaaaaaaaaaaaaaaaccccccccccccaaacccccccccccaaacccccccccccccccccaaaa
-abcccccaacccccaacccccccccccaaaaaaaaaaaaaccccccccccccccccccccccccccccccccccccccccccccccccaaaaa"""
+    map_string = FULL_TEST_MAP
 
     world = Map.from_string(map_string)
     walker = Walker(world)
     path = Path(walker)
 
-    # THEN the path length should be 31 and the ending field 2, 5, 25
+    # THEN the path length should be 412 and the ending field 68, 20, 25
     shortest = ShortestPathFinder.solve(world, path, walker)
 
-    assert shortest.get_length() == 32 # Length of path is 32 because the starting field is also included in path
-    assert shortest.get_end() == Field(5, 2, 25)
+    assert shortest.get_length() == 413 # Length of path is 413 because the starting field is also included in path
+    assert shortest.get_end() == Field(68, 20, 25)
+
+def test_solving_small_full_test_map_bfs_and_dfs_agree():
+
+    # GIVEN a mutli line string with a full map
+    map_string = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+    world = Map.from_string(map_string)
+
+    # WHEN solving it with both engines
+    walker = Walker(world)
+    bfs = ShortestPathFinder.solve(world, Path(walker), walker, engine="bfs")
+    walker = Walker(world)
+    dfs = ShortestPathFinder.solve(world, Path(walker), walker, engine="dfs")
+
+    # THEN both paths should have the same length, start and end
+    assert bfs.get_length() == dfs.get_length() == 32
+    assert bfs.fields[0] == dfs.fields[0] == world.start
+    assert bfs.get_end() == dfs.get_end() == world.end
+
+def test_distance_field_of_small_full_test_map():
+
+    # GIVEN a mutli line string with a full map
+    map_string = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+    world = Map.from_string(map_string)
+
+    # WHEN computing the distances to the end with a single reverse search
+    distances = ShortestPathFinder.distance_field(world)
+
+    # THEN the start should be 31 steps away and the end itself 0
+    assert distances.get_distance(0, 0) == 31
+    assert distances.get_distance(5, 2) == 0
+    # AND the path from the start should be as long as the one found by solving
+    walker = Walker(world)
+    assert distances.get_path(world.start).get_length() == ShortestPathFinder.solve(world, Path(walker), walker).get_length()
+
+def test_distance_field_unreachable():
+    # GIVEN a mutli line string where the corner can not be reached from the middle
+    map_string = """\
+fbf
+bab
+fbf"""
+    world = Map.from_string(map_string)
+    world.set_end(0, 0)
+
+    # WHEN computing the distances to the corner
+    distances = ShortestPathFinder.distance_field(world)
+
+    # THEN the middle should have no distance and no path
+    assert distances.get_distance(1, 1) is None
+    assert distances.get_path(world.get_field(1, 1)) is None
+
+def test_solving_best_start_of_small_full_test_map():
+
+    # GIVEN a mutli line string with a full map
+    map_string = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+    world = Map.from_string(map_string)
+
+    # WHEN looking for the best starting field with elevation a
+    best = ShortestPathFinder.solve_best_start(world)
+
+    # THEN the path should take 29 steps from an a field to the end
+    assert best.get_length() == 30
+    assert best.fields[0].elevation == 0
+    assert best.get_end() == world.end
+
+def test_solving_full_test_map_with_astar():
+
+    # GIVEN the full test map from test_solving_full_test_map_
+    map_string = FULL_TEST_MAP
+
+    world = Map.from_string(map_string)
+    walker = Walker(world)
+
+    # WHEN solving it with A*
+    shortest = ShortestPathFinder.solve(world, Path(walker), walker, engine="astar")
+
+    # THEN the path should be as long as the one found by BFS
+    assert shortest.get_length() == 413
+    assert shortest.get_end() == Field(68, 20, 25)
+
+def test_solving_an_open_map_with_astar_expands_less():
+
+    # GIVEN a large flat map with start and end in opposite corners
+    world = Map.from_string("\n".join("a" * 100 for _ in range(100)))
+    world.set_start(0, 0)
+    world.set_end(99, 99)
+
+    # WHEN solving it with BFS and with A*
+    walker = Walker(world)
+    bfs = ShortestPathFinder.solve(world, Path(walker), walker, engine="bfs")
+    bfs_expanded = ShortestPathFinder.stats.expanded
+    walker = Walker(world)
+    astar = ShortestPathFinder.solve(world, Path(walker), walker, engine="astar")
+    astar_expanded = ShortestPathFinder.stats.expanded
+
+    # THEN both paths should be optimal, but A* should expand far fewer fields
+    assert bfs.get_length() == astar.get_length() == 199
+    assert astar.get_end() == world.end
+    assert astar_expanded * 10 < bfs_expanded
+
+def test_solving_full_test_map_bidirectional():
+
+    # GIVEN the full test map from test_solving_full_test_map_
+    world = Map.from_string(FULL_TEST_MAP)
+    walker = Walker(world)
+
+    # WHEN solving it searching from both ends
+    shortest = ShortestPathFinder.solve(world, Path(walker), walker, engine="bidirectional")
+
+    # THEN the path should be as long as the one found by BFS and consist of legal steps
+    assert shortest.get_length() == 413
+    assert shortest.fields[0] == world.start
+    assert shortest.get_end() == Field(68, 20, 25)
+    for step, next_step in zip(shortest.fields, shortest.fields[1:]):
+        assert abs(step.x - next_step.x) + abs(step.y - next_step.y) == 1
+        assert Walker(step).can_climb(next_step)
+    # AND the expanded fields of both sides should be reported
+    assert ShortestPathFinder.stats.expanded_forward > 0
+    assert ShortestPathFinder.stats.expanded_backward > 0
+    assert ShortestPathFinder.stats.expanded == ShortestPathFinder.stats.expanded_forward + ShortestPathFinder.stats.expanded_backward
+
+def test_solving_bidirectional_agrees_with_bfs():
+
+    # GIVEN the maps of the small solving tests
+    cases = [
+        ("ab", (0, 0), (1, 0)),
+        ("ad\nbc", (0, 0), (1, 1)),
+        ("fbf\nbab\nfbf", (1, 1), (1, 2)),
+        ("fbf\nbab\nfbf", (1, 1), (0, 0)),
+        ("fbf\nbab\nfbf", (0, 1), (1, 0)),
+        ("abda\nabcd", (0, 0), (3, 0)),
+        ("abdc\nabcd", (0, 0), (3, 0)),
+        ("abc", (1, 0), (1, 0)),
+    ]
+    for map_string, start, end in cases:
+        world = Map.from_string(map_string)
+        world.set_start(*start)
+        world.set_end(*end)
+
+        # WHEN solving them with BFS and bidirectional
+        walker = Walker(world)
+        bfs = ShortestPathFinder.solve(world, Path(walker), walker, engine="bfs")
+        walker = Walker(world)
+        bidirectional = ShortestPathFinder.solve(world, Path(walker), walker, engine="bidirectional")
+
+        # THEN both should find a path of the same length or both none
+        if bfs is None:
+            assert bidirectional is None
+        else:
+            assert bidirectional.get_length() == bfs.get_length()
+            assert bidirectional.fields[0] == world.start
+            assert bidirectional.get_end() == world.end
+
+def test_solving_a_batch_of_pairs():
+
+    # GIVEN the full test map and pairs sharing an end and pairs sharing a start
+    world = Map.from_string(FULL_TEST_MAP)
+    fields = [world.get_field(x, y) for (x, y) in [(0, 0), (0, 20), (10, 5), (40, 30), (68, 20), (88, 40)]]
+    by_end = [(start, world.end) for start in fields]
+    by_start = [(world.start, end) for end in fields]
+
+    for pairs in (by_end, by_start, by_end + by_start):
+        # WHEN solving all pairs in one batch
+        paths = ShortestPathFinder.solve_batch(world, pairs)
+
+        # THEN every path should be as long as the one found by solving the pair on its own
+        assert len(paths) == len(pairs)
+        for (start, end), path in zip(pairs, paths):
+            world.set_start(start.x, start.y)
+            world.set_end(end.x, end.y)
+            walker = Walker(world)
+            single = ShortestPathFinder.solve(world, Path(walker), walker)
+            if single is None:
+                assert path is None
+            else:
+                assert path.get_length() == single.get_length()
+                assert path.fields[0] == start
+                assert path.get_end() == end
+        world.set_start(0, 20)
+        world.set_end(68, 20)
+
+def test_solving_a_batch_with_unreachable_pair():
+
+    # GIVEN a map where the corner can not be reached from the middle
+    world = Map.from_string("fbf\nbab\nfbf")
+    pairs = [
+        (world.get_field(1, 1), world.get_field(0, 0)),
+        (world.get_field(1, 1), world.get_field(1, 2)),
+    ]
+
+    # WHEN solving both pairs in one batch
+    paths = ShortestPathFinder.solve_batch(world, pairs)
+
+    # THEN the first pair should have no path and the second the direct step
+    assert paths[0] is None
+    assert paths[1].fields == [Field(1, 1, 0), Field(1, 2, 1)]
+
+@pytest.mark.parametrize("engine", ["bfs", "astar", "bidirectional", "dfs"])
+def test_solving_with_stats_and_hooks(engine, capsys):
+
+    # GIVEN a mutli line string with a full map
+    map_string = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+    world = Map.from_string(map_string)
+    walker = Walker(world)
+    expanded_fields = []
+    goals = []
+
+    # WHEN solving it with stats and hooks
+    shortest, stats = ShortestPathFinder.solve_with_stats(
+        world, Path(walker), walker, engine=engine, on_expand=expanded_fields.append, on_goal=goals.append)
+
+    # THEN the stats should describe the search
+    assert shortest.get_length() == 32
+    assert stats is ShortestPathFinder.stats
+    assert stats.engine == engine
+    assert stats.expanded == len(expanded_fields) > 0
+    assert stats.expanded == stats.expanded_forward + stats.expanded_backward
+    assert stats.edges_scanned > 0
+    assert stats.peak_frontier > 0
+    assert stats.parse_seconds > 0
+    assert stats.search_seconds >= 0
+    assert set(stats.as_dict()) >= {"expanded", "edges_tested", "peak_frontier", "index_seconds", "reconstruct_seconds"}
+    # AND the goal hook should get the found path
+    assert goals == [shortest]
+    # AND nothing should be printed
+    assert capsys.readouterr().out == ""
+
+def test_solving_with_a_cached_index_tests_no_edges():
+
+    # GIVEN a map that was solved once
+    world = Map.from_string("Sabc\nfedE")
+    walker = Walker(world)
+    ShortestPathFinder.solve(world, Path(walker), walker)
+    # climbing rule was called for every pair of neighbouring fields in both directions
+    assert ShortestPathFinder.stats.edges_tested == 20
+    first_expanded = ShortestPathFinder.stats.expanded
+
+    # WHEN solving it again
+    walker = Walker(world)
+    ShortestPathFinder.solve(world, Path(walker), walker)
+
+    # THEN the adjacency index should be reused without calling the climbing rule
+    assert ShortestPathFinder.stats.edges_tested == 0
+    assert ShortestPathFinder.stats.expanded == first_expanded
+
+def test_solving_with_unknown_engine():
+    # GIVEN a single line map
+    world = Map.from_string("SE")
+    walker = Walker(world)
+
+    # WHEN solving with an engine that does not exist
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        ShortestPathFinder.solve(world, Path(walker), walker, engine="magic")
+    assert str(excinfo.value) == "Unknown engine magic!"
+
+def test_counting_and_listing_shortest_paths_of_a_flat_map():
+    # GIVEN a flat 3x3 map from corner to corner
+    world = Map.from_string("aaa\naaa\naaa")
+    world.set_start(0, 0)
+    world.set_end(2, 2)
+
+    # WHEN counting and listing the shortest paths
+    count = ShortestPathFinder.count_shortest_paths(world)
+    paths = [shortest.fields for shortest in ShortestPathFinder.iter_shortest_paths(world)]
+
+    # THEN there should be 6 different paths with 4 steps each
+    assert count == 6
+    assert len(paths) == 6
+    assert len({tuple(fields) for fields in paths}) == 6
+    for fields in paths:
+        assert len(fields) == 5
+        assert fields[0] == world.start
+        assert fields[-1] == world.end
+        for field, next_field in zip(fields, fields[1:]):
+            assert next_field in world.get_neighbours(field)
+
+def test_counting_shortest_paths_of_the_small_full_test_map():
+    # GIVEN the small full test map
+    world = Map.from_string("""\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi""")
+
+    # WHEN counting and listing the shortest paths
+    count = ShortestPathFinder.count_shortest_paths(world)
+    paths = list(ShortestPathFinder.iter_shortest_paths(world))
+
+    # THEN every listed path should be a legal shortest path and the count should match
+    assert count == len(paths) > 1
+    for shortest in paths:
+        assert shortest.get_length() == 32
+        for field, next_field in zip(shortest.fields, shortest.fields[1:]):
+            assert Walker(field).can_climb(next_field)
+
+def test_counting_more_shortest_paths_than_fit_in_64_bits():
+    # GIVEN a flat 40x40 map from corner to corner
+    world = Map.from_string("\n".join("a" * 40 for _ in range(40)), compact=True)
+    world.set_start(0, 0)
+    world.set_end(39, 39)
+
+    # WHEN counting the shortest paths and taking only the first one
+    count = ShortestPathFinder.count_shortest_paths(world)
+    first = next(ShortestPathFinder.iter_shortest_paths(world))
+
+    # THEN the count should be exact and the path 78 steps long
+    assert count == 27217014869199032015600  # 78 choose 39
+    assert count > 2 ** 64
+    assert first.get_length() == 79
+
+def test_counting_shortest_paths_unreachable_and_to_the_start():
+    # GIVEN a map where the end can not be reached
+    world = Map.from_string("Sbz\nabz\nzzE")
+
+    # WHEN counting the paths to the end and to the start
+    # THEN there should be none to the end and one to the start itself
+    assert ShortestPathFinder.count_shortest_paths(world) == 0
+    assert list(ShortestPathFinder.iter_shortest_paths(world)) == []
+    assert ShortestPathFinder.count_shortest_paths(world, end=world.start) == 1
+    assert [shortest.fields for shortest in ShortestPathFinder.iter_shortest_paths(world, end=world.start)] == [[world.start]]
+
+def test_reachability_index_of_a_map():
+    # GIVEN a map with a valley in the middle and peaks in the corners
+    world = Map.from_string("fbf\nbab\nfbf")
+
+    # WHEN building the reachability index
+    reachability = world.get_reachability()
+
+    # THEN the valley and its sides should be one component, every peak its own
+    assert reachability.count_components() == 5
+    assert reachability.get_component(Field(1, 1, 0)) == reachability.get_component(Field(0, 1, 1))
+    # AND the peaks should reach the valley, but not the other way round
+    assert reachability.can_reach(Field(0, 0, 5), Field(1, 1, 0)) == True
+    assert reachability.can_reach(Field(1, 1, 0), Field(0, 0, 5)) == False
+    assert reachability.can_reach(Field(0, 0, 5), Field(2, 2, 5)) == False
+    # AND the index should be cached until the map changes
+    assert world.get_reachability() is reachability
+    world.add_field(0, 0, 1)
+    assert world.get_reachability(build=False) is None
+    assert world.get_reachability().can_reach(Field(1, 1, 0), Field(0, 0, 1)) == True
+
+def test_reachability_agrees_with_distance_fields():
+    # GIVEN random maps
+    generator = random.Random(19)
+    for _ in range(50):
+        width = generator.randint(1, 7)
+        height = generator.randint(1, 7)
+        world = Map.from_string("\n".join(
+            "".join(generator.choice("abcdf") for _ in range(width)) for _ in range(height)), compact=True)
+        reachability = world.get_reachability()
+        # WHEN asking for every pair of fields
+        for target in range(width * height):
+            distances = ShortestPathFinder.distance_field(world, world.get_field_at(target))
+            for start in range(width * height):
+                # THEN the index should know whether the target can be reached
+                reachable = distances.distances[start] >= 0
+                assert reachability.can_reach(world.get_field_at(start), world.get_field_at(target)) == reachable
+
+def test_reachability_through_a_chain_of_components():
+    # GIVEN a ramp two levels per column high which can only be walked down
+    world = Map.from_string("acegikmoqsuwy\nacegikmoqsuwy", compact=True)
+    world.set_policy(ClimbingPolicy(max_climb=0))
+    # WHEN building the reachability index
+    reachability = world.get_reachability()
+    # THEN every column should be its own component
+    assert reachability.count_components() == 13
+    assert reachability.get_component(Field(3, 0, 6)) == reachability.get_component(Field(3, 1, 6))
+    # AND the top should reach every column down the ramp, but not the other way round
+    assert reachability.can_reach(Field(12, 0, 24), Field(0, 1, 0)) == True
+    assert reachability.can_reach(Field(5, 0, 10), Field(4, 1, 8)) == True
+    assert reachability.can_reach(Field(0, 1, 0), Field(12, 0, 24)) == False
+    assert reachability.can_reach(Field(4, 1, 8), Field(5, 0, 10)) == False
+
+@pytest.mark.parametrize("engine", ["bfs", "dfs"])
+def test_solving_an_unreachable_end_with_reachability_index(engine):
+    # GIVEN a map where the end can not be reached, with a built reachability index
+    world = Map.from_string("Sbz\nabz\nzzE")
+    world.get_reachability()
+    walker = Walker(world)
+
+    # WHEN solving it
+    shortest, stats = ShortestPathFinder.solve_with_stats(world, Path(walker), walker, engine=engine)
+
+    # THEN no field should be searched
+    assert shortest is None
+    assert stats.unreachable == True
+    assert stats.expanded == 0
+
+def test_climbing_policy_allows_steps():
+    # GIVEN a policy with two levels up, three down and a forbidden band
+    policy = ClimbingPolicy(max_climb=2, max_descent=3, forbidden=[(10, 12)])
+    # WHEN checking steps
+    # THEN the limits and the band should be applied to the target field
+    assert policy.allows(0, 2) == True
+    assert policy.allows(0, 3) == False
+    assert policy.allows(5, 2) == True
+    assert policy.allows(5, 1) == False
+    assert policy.allows(9, 10) == False
+    assert policy.allows(12, 13) == True
+    # AND the default policy should be the one of the puzzle
+    assert DEFAULT_POLICY == ClimbingPolicy(1, None, ())
+    assert DEFAULT_POLICY.allows(25, 0) == True and DEFAULT_POLICY.allows(0, 2) == False
+
+@pytest.mark.parametrize("arguments, message", [
+    ({"max_climb": -1}, "Climb and descent limits must be at least 0!"),
+    ({"max_descent": -1}, "Climb and descent limits must be at least 0!"),
+    ({"forbidden": [(5, 3)]}, "Invalid forbidden band (5, 3)!"),
+])
+def test_invalid_climbing_policy(arguments, message):
+    # GIVEN invalid policy arguments
+    # WHEN creating the policy
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        ClimbingPolicy(**arguments)
+    assert str(excinfo.value) == message
+
+def test_climbing_policies_are_immutable_values():
+    # GIVEN a policy
+    policy = ClimbingPolicy(max_climb=2, forbidden=[(3, 4)])
+    # WHEN changing, comparing or pickling it
+    with pytest.raises(AttributeError):
+        policy.max_climb = 5
+    # THEN it should behave like a value
+    assert policy == ClimbingPolicy(2, None, ((3, 4),))
+    assert hash(policy) == hash(ClimbingPolicy(2, None, ((3, 4),)))
+    assert pickle.loads(pickle.dumps(policy)) == policy
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("policy", [
+    DEFAULT_POLICY,
+    ClimbingPolicy(max_climb=2),
+    ClimbingPolicy(max_climb=1, max_descent=1),
+    ClimbingPolicy(max_climb=3, max_descent=2, forbidden=[(2, 2), (5, 6)]),
+])
+def test_masks_agree_with_the_policy(compact, policy):
+    # GIVEN random maps
+    generator = random.Random(25)
+    for _ in range(20):
+        width = generator.randint(1, 6)
+        height = generator.randint(1, 6)
+        world = Map.from_string("\n".join(
+            "".join(generator.choice("abcdefgh") for _ in range(width)) for _ in range(height)), compact=compact)
+        world.set_policy(policy)
+        # WHEN building the adjacency index from the masks
+        adjacency = world.get_adjacency()
+        reverse = world.get_adjacency(reverse=True)
+        # THEN it should contain the same moves as checking every neighbour with the policy
+        rule = lambda from_field, to_field: policy.allows(from_field.elevation, to_field.elevation)
+        expected = Adjacency(world, rule)
+        assert adjacency.offsets == expected.offsets
+        assert adjacency.neighbours == expected.neighbours
+        assert reverse.neighbours == Adjacency(world, rule, True).neighbours
+        # AND the masks should match the walker of every field
+        for index in range(width * height):
+            walker = Walker(world.get_field_at(index), policy)
+            neighbours = world.get_neighbours(walker.position)
+            assert walker.count_climbable_neighbors(neighbours) == adjacency.offsets[index + 1] - adjacency.offsets[index]
+
+@pytest.mark.parametrize("policy", [
+    ClimbingPolicy(max_climb=3),
+    ClimbingPolicy(max_climb=5, max_descent=2),
+    ClimbingPolicy(max_climb=0, max_descent=4),
+    ClimbingPolicy(max_climb=2, forbidden=[(4, 6)]),
+])
+def test_engines_agree_under_other_policies(policy):
+    # GIVEN random maps with a random end and a policy other than the default
+    generator = random.Random(7)
+    for _ in range(20):
+        width = generator.randint(3, 8)
+        height = generator.randint(3, 8)
+        world = Map.from_string("\n".join(
+            "".join(generator.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(width)) for _ in range(height)), compact=True)
+        world.set_policy(policy)
+        world.set_end(generator.randrange(width), generator.randrange(height))
+        distances = ShortestPathFinder.distance_field(world, world.end)
+        # WHEN solving from every field that can reach the end with every engine
+        for index in distances.order:
+            start = world.get_field_at(index)
+            world.set_start(start.x, start.y)
+            for engine in ["bfs", "astar", "bidirectional", "wavefront"]:
+                walker = Walker(world)
+                shortest = ShortestPathFinder.solve(world, Path(walker), walker, engine=engine)
+                # THEN every path should be as short as the distance to the end
+                assert shortest.get_length() - 1 == distances.distances[index]
+
+def test_solving_with_a_walker_of_another_policy():
+    # GIVEN a walker who may climb further than the policy of the map allows
+    world = Map.from_string("Sdz\nzzE")
+    walker = Walker(world, ClimbingPolicy(max_climb=30))
+    assert walker.can_climb(Field(1, 0, 3)) == True
+    # WHEN solving the map with it
+    # THEN an error should be raised instead of searching by the policy of the map
+    with pytest.raises(Exception) as excinfo:
+        ShortestPathFinder.solve(world, Path(walker), walker)
+    assert str(excinfo.value) == "The walker has to climb by the policy of the map!"
+
+def test_solving_from_a_field_outside_the_map():
+    # GIVEN a walker outside of the map
+    world = Map.from_string("SbcE")
+    walker = Walker(world.get_field(5, 0))
+    # WHEN solving the map from there
+    # THEN an error should be raised instead of starting at another field
+    with pytest.raises(Exception) as excinfo:
+        ShortestPathFinder.solve(world, Path(walker), walker)
+    assert str(excinfo.value) == "Field (5, 0) is not on the map!"
+
+def test_walker_on_a_map_counts_with_the_masks():
+    # GIVEN a walker on a map, with the masks compiled
+    world = Map.from_string("Sbz\nabE", compact=True)
+    walker = Walker(world)
+    world.get_masks()
+    # WHEN counting the climbable neighbours of the start
+    # THEN only the step to b and a should count
+    assert walker.count_climbable_neighbors() == 2
+    walker.position = world.get_field(1, 0)
+    assert walker.count_climbable_neighbors() == 2
+
+@pytest.mark.parametrize("engine", ["bfs", "astar", "bidirectional", "dfs", "wavefront"])
+def test_changing_the_policy_of_a_map(engine):
+    # GIVEN a map with a cliff of two levels up to the end and a detour around it
+    world = Map.from_string("aac\nabb")
+    world.set_start(0, 0)
+    world.set_end(2, 0)
+
+    def solve():
+        walker = Walker(world)
+        return ShortestPathFinder.solve(world, Path(walker), walker, engine=engine)
+
+    # WHEN solving it with different policies
+    default = solve()
+    world.set_policy(ClimbingPolicy(max_climb=2))
+    climbing = solve()
+    world.set_policy(ClimbingPolicy(max_climb=2, forbidden=[(2, 2)]))
+    forbidden = solve()
+
+    # THEN the cliff should only be climbed when two levels are allowed
+    assert default.get_length() == 5
+    assert climbing.get_length() == 3
+    # AND no path should lead onto a forbidden field
+    assert forbidden is None
 
 
 #############################
@@ -518,6 +1088,169 @@ a.mmlxl"""
         world = Map.from_string(map_string)
     assert str(excinfo.value) == "Invalid cell detected at (1, 0)!"
 
+def test_create_a_compact_map_from_string():
+    # GIVEN a multiline string with start and end
+    map_string = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+    # WHEN creating a dict backed and a compact map from the string
+    world = Map.from_string(map_string)
+    compact = Map.from_string(map_string, compact=True)
+    # THEN the compact map should contain the same fields, start, end and neighbours
+    assert isinstance(compact, CompactMap)
+    assert (compact.width, compact.height) == (world.width, world.height)
+    for y in range(world.height):
+        for x in range(world.width):
+            assert compact.get_field(x, y) == world.get_field(x, y)
+    assert compact.start == world.start
+    assert compact.end == world.end
+    assert compact.get_neighbours(Field(0, 0, 0)) == world.get_neighbours(Field(0, 0, 0))
+
+def test_solving_a_compact_map():
+    # GIVEN a compact map
+    map_string = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+    world = Map.from_string(map_string, compact=True)
+    walker = Walker(world)
+    # WHEN solving it
+    shortest = ShortestPathFinder.solve(world, Path(walker), walker)
+    # THEN the path length should be 31
+    assert shortest.get_length() == 32
+    assert shortest.get_end() == Field(5, 2, 25)
+
+def test_create_a_compact_map_with_invalid_line_length():
+    # GIVEN a multiline string with lines of different length
+    map_string = """\
+abc
+ab"""
+    # WHEN creating a compact map from the string
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        Map.from_string(map_string, compact=True)
+    assert str(excinfo.value) == "Invalid line length detected at line 1!"
+
+def test_compact_map_uses_less_memory():
+    # GIVEN a 200x200 map
+    map_string = "\n".join("abcdefghijklmnopqrstuvwxyz"[y % 26] * 200 for y in range(200))
+
+    # WHEN creating it as dict backed and as compact map
+    tracemalloc.start()
+    world = Map.from_string(map_string)
+    dict_size = tracemalloc.get_traced_memory()[0]
+    del world
+    tracemalloc.stop()
+    tracemalloc.start()
+    compact = Map.from_string(map_string, compact=True)
+    compact_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # THEN the compact map should need at least ten times less memory
+    assert compact_size * 10 < dict_size
+
+def test_adjacency_index_of_a_map():
+    # GIVEN a multiline string
+    map_string = """\
+ac
+bd"""
+    world = Map.from_string(map_string)
+    # WHEN getting the adjacency index
+    adjacency = world.get_adjacency()
+    # THEN the legal moves should be listed as indices (y * width + x) in the order N, S, W, E
+    assert list(adjacency.get_moves(0)) == [2]        # a -> b, c is too high
+    assert list(adjacency.get_moves(1)) == [3, 0]     # c -> d, a
+    assert list(adjacency.get_moves(2)) == [0]        # b -> a, d is too high
+    assert list(adjacency.get_moves(3)) == [1, 2]     # d -> c, b
+    # AND the reversed index should list where a step into a field can come from
+    assert list(world.get_adjacency(reverse=True).get_moves(3)) == [1]
+
+def test_adjacency_index_is_cached_and_invalidated():
+    # GIVEN a map with an adjacency index
+    world = Map.from_string("ac")
+    adjacency = world.get_adjacency()
+    assert world.get_adjacency() is adjacency
+    assert list(adjacency.get_moves(0)) == []
+    # WHEN changing a field of the map
+    world.add_field(1, 0, 1)
+    # THEN a new index with the changed moves should be built
+    assert world.get_adjacency() is not adjacency
+    assert list(world.get_adjacency().get_moves(0)) == [1]
+
+def test_adjacency_index_of_a_compact_map_is_invalidated():
+    # GIVEN a compact map with an adjacency index
+    world = Map.from_string("ac", compact=True)
+    assert list(world.get_adjacency().get_moves(0)) == []
+    # WHEN changing a field of the map
+    world.add_field(1, 0, 1)
+    # THEN the index should contain the new move
+    assert list(world.get_adjacency().get_moves(0)) == [1]
+
+def test_create_a_map_from_file(tmp_path):
+    # GIVEN a map file with start and end
+    map_string = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi
+"""
+    map_file = tmp_path / "map.txt"
+    map_file.write_bytes(map_string.encode())
+    # WHEN loading the map from the file
+    world = Map.from_file(str(map_file))
+    # THEN it should equal the map created from the string
+    expected = Map.from_string(map_string)
+    assert isinstance(world, CompactMap)
+    assert (world.width, world.height) == (expected.width, expected.height)
+    for y in range(expected.height):
+        for x in range(expected.width):
+            assert world.get_field(x, y) == expected.get_field(x, y)
+    assert world.start == expected.start
+    assert world.end == expected.end
+
+def test_create_a_map_from_file_with_windows_line_endings(tmp_path):
+    # GIVEN a map file with \r\n line endings
+    map_file = tmp_path / "map.txt"
+    map_file.write_bytes(b"Sb\r\ncE\r\n")
+    # WHEN loading the map from the file
+    world = Map.from_file(str(map_file))
+    # THEN the line endings should not be part of the map
+    assert (world.width, world.height) == (2, 2)
+    assert world.get_field(0, 1) == Field(0, 1, 2)
+    assert world.end == Field(1, 1, 25)
+
+@pytest.mark.parametrize("content, message", [
+    (b"Sab\naEa\naSa", "Multiple starting points detected!"),
+    (b"SaS\naEa", "Multiple starting points detected!"),
+    (b"SaE\naEa", "Multiple ending points detected!"),
+    (b"Sab\naEa\na.a", "Invalid cell detected at (1, 2)!"),
+    (b"Sab\naE", "Invalid line length detected at line 1!"),
+])
+def test_create_an_invalid_map_from_file(tmp_path, content, message):
+    # GIVEN an invalid map file
+    map_file = tmp_path / "map.txt"
+    map_file.write_bytes(content)
+    # WHEN loading the map from the file
+    # THEN the same errors as for maps from strings should be raised
+    with pytest.raises(Exception) as excinfo:
+        Map.from_file(str(map_file))
+    assert str(excinfo.value) == message
+
+def test_an_empty_map_from_file(tmp_path):
+    # GIVEN an empty map file
+    map_file = tmp_path / "map.txt"
+    map_file.write_bytes(b"")
+    # WHEN loading the map from the file
+    world = Map.from_file(str(map_file))
+    # THEN the map should be empty
+    assert (world.width, world.height) == (0, 0)
+
 def test_get_neightbors_in_middle():
     # GIVEN a multiline string with start and end
     map_string = """\
@@ -614,6 +1347,28 @@ abdefghi"""
         Field(x=1, y=5, elevation=sys.maxsize), #east
         )
 
+def test_fields_are_immutable_and_hashable():
+    # GIVEN a field
+    field = Field(1, 2, 3)
+    # WHEN trying to change it
+    # THEN an error should be raised
+    with pytest.raises(AttributeError):
+        field.elevation = 4
+    # AND it should have no __dict__ and work in sets
+    assert not hasattr(field, "__dict__")
+    assert {field, Field(1, 2, 3), Field(1, 2, 4)} == {Field(1, 2, 3), Field(1, 2, 4)}
+
+def test_fields_outside_the_map_are_shared():
+    # GIVEN a dict backed and a compact map
+    for world in (Map.from_string("ab\ncd"), Map.from_string("ab\ncd", compact=True)):
+        # WHEN getting the neighbours of a corner twice
+        first = world.get_neighbours(world.get_field(0, 0))
+        second = world.get_neighbours(world.get_field(0, 0))
+        # THEN the fields outside the map should be the same objects
+        assert first[0] is second[0]
+        assert first[2] is second[2]
+        assert first[0] == Field(0, -1, sys.maxsize)
+
 def test_an_empty_map():
     # GIVEN an empty map
     map_string = """\
@@ -668,4 +1423,49 @@ def test_remove_last_step():
     # THEN the last step should be deleted
     expected_fields = [(Field(0, 0, 10)), (Field(1, 0, 10))]
     p.remove_last_step()
-    assert p.fields == expected_fields
\ No newline at end of file
+    assert p.fields == expected_fields
+
+def test_removed_step_is_no_longer_visited():
+    # GIVEN a Path with two steps
+    p = Path()
+    p.add_step(Field(0, 0, 10))
+    p.add_step(Field(1, 0, 10))
+    # WHEN removing the last step
+    p.remove_last_step()
+    # THEN only the first field should still be visited
+    assert p.field_visited(Field(0, 0, 10)) == True
+    assert p.field_visited(Field(1, 0, 10)) == False
+    assert p.get_end() == Field(0, 0, 10)
+
+def test_fields_are_built_once_until_the_path_changes():
+    # GIVEN a Path with two steps
+    p = Path()
+    p.add_step(Field(0, 0, 10))
+    p.add_step(Field(1, 0, 10))
+    # WHEN reading the fields twice
+    fields = p.fields
+    # THEN the same list should be returned
+    assert p.fields is fields
+    # AND after adding a step the list should be built again
+    p.add_step(Field(2, 0, 10))
+    assert p.fields is not fields
+    assert p.fields == [Field(0, 0, 10), Field(1, 0, 10), Field(2, 0, 10)]
+    p.remove_last_step()
+    assert p.fields == fields
+
+def test_snapshot_is_independent_of_the_path():
+    # GIVEN a Path with two steps and a snapshot of it
+    p = Path()
+    p.add_step(Field(0, 0, 10))
+    p.add_step(Field(1, 0, 10))
+    snapshot = p.snapshot()
+    # WHEN changing the path afterwards
+    p.remove_last_step()
+    p.add_step(Field(0, 1, 10))
+    p.add_step(Field(0, 2, 10))
+    # THEN the snapshot should still contain the old steps
+    assert snapshot.fields == [Field(0, 0, 10), Field(1, 0, 10)]
+    assert snapshot.get_length() == 2
+    assert snapshot.field_visited(Field(1, 0, 10)) == True
+    assert snapshot.field_visited(Field(0, 1, 10)) == False
+    assert p.get_length() == 3
@@ -0,0 +1,65 @@
+import pytest
+from src.model import Map
+from src.binary import BinaryMap
+from src.parallel import solve_file, solve_files, solve_directory
+
+SMALL_TEST_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+def write_maps(directory):
+    # write a solvable, an unreachable and an invalid map into directory
+    (directory / "small.txt").write_text(SMALL_TEST_MAP)
+    (directory / "unreachable.txt").write_text("Sbz\nbbE")
+    (directory / "invalid.txt").write_text("Sa.E")
+    (directory / "notes.md").write_text("not a map")
+
+def test_solving_a_single_file(tmp_path):
+    # GIVEN a map file
+    write_maps(tmp_path)
+    # WHEN solving it including the path
+    result = solve_file(str(tmp_path / "small.txt"), include_path=True)
+    # THEN the result should contain the number of steps and the coordinates of the path
+    assert result["steps"] == 31
+    assert result["path"][0] == (0, 0)
+    assert result["path"][-1] == (5, 2)
+
+def test_solving_a_directory_in_parallel(tmp_path):
+    # GIVEN a directory with map files
+    write_maps(tmp_path)
+    # WHEN solving the directory with two workers and chunks of two files
+    results = list(solve_directory(str(tmp_path), workers=2, chunk_size=2, include_stats=True))
+    # THEN every map file should have a result and other files should be ignored
+    by_name = {result["file"].split("/")[-1]: result for result in results}
+    assert sorted(by_name) == ["invalid.txt", "small.txt", "unreachable.txt"]
+    assert by_name["small.txt"]["steps"] == 31
+    assert by_name["small.txt"]["stats"]["engine"] == "bfs"
+    assert by_name["unreachable.txt"]["steps"] is None
+    assert by_name["invalid.txt"]["error"] == "Invalid cell detected at (2, 0)!"
+
+def test_solving_files_with_another_engine(tmp_path):
+    # GIVEN a map file
+    write_maps(tmp_path)
+    # WHEN solving it with A* in the pool
+    results = list(solve_files([str(tmp_path / "small.txt")], workers=1, engine="astar"))
+    # THEN the number of steps should be the same
+    assert results[0]["steps"] == 31
+
+def test_solving_a_directory_of_binary_maps(tmp_path):
+    # GIVEN a directory with a binary map file
+    BinaryMap.write(Map.from_string(SMALL_TEST_MAP), str(tmp_path / "small.hmap"))
+    # WHEN solving the binary map files of the directory
+    results = list(solve_directory(str(tmp_path), pattern="*.hmap", workers=1))
+    # THEN the map should be opened as binary map and solved
+    assert [result["steps"] for result in results] == [31]
+
+def test_invalid_chunk_size():
+    # GIVEN a chunk size of 0
+    # WHEN solving files
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        list(solve_files([], chunk_size=0))
+    assert str(excinfo.value) == "Chunk size must be at least 1!"
@@ -0,0 +1,113 @@
+import sys
+import asyncio
+import pytest
+from src.service import SolveService, send_request
+
+SMALL_TEST_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+def test_solving_over_tcp():
+    # GIVEN a service listening on the TCP loopback
+    async def scenario():
+        service = SolveService()
+        server = await service.start_tcp()
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        # WHEN sending a map and a solve request for it
+        added = await send_request(reader, writer, {"op": "map", "map": SMALL_TEST_MAP})
+        solved = await send_request(reader, writer, {"op": "solve", "map_id": added["map_id"], "path": True, "id": 7})
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return added, solved
+
+    added, solved = asyncio.run(scenario())
+
+    # THEN the map should be registered and the answer should be the 31 steps of the puzzle
+    assert (added["width"], added["height"]) == (8, 5)
+    assert solved["steps"] == 31
+    assert solved["path"][0] == [0, 0]
+    assert solved["path"][-1] == [5, 2]
+    assert solved["id"] == 7
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets only")
+def test_solving_over_a_unix_socket(tmp_path):
+    # GIVEN a service listening on a Unix socket
+    async def scenario():
+        service = SolveService()
+        server = await service.start_unix(str(tmp_path / "solve.sock"))
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / "solve.sock"))
+        # WHEN solving from another start
+        added = await send_request(reader, writer, {"op": "map", "map": SMALL_TEST_MAP})
+        solved = await send_request(reader, writer, {"op": "solve", "map_id": added["map_id"], "start": [0, 4]})
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return solved
+
+    # THEN the shortest path from there should be found
+    assert asyncio.run(scenario()) == {"steps": 29}
+
+def test_concurrent_requests_for_the_same_target_are_coalesced():
+    # GIVEN a service with a registered map
+    async def scenario():
+        service = SolveService()
+        map_id = (await service.handle_message({"op": "map", "map": SMALL_TEST_MAP}))["map_id"]
+        # WHEN sending three requests for the same target at once and one afterwards
+        answers = await asyncio.gather(
+            service.handle_message({"op": "solve", "map_id": map_id}),
+            service.handle_message({"op": "solve", "map_id": map_id, "start": [0, 4]}),
+            service.handle_message({"op": "solve", "map_id": map_id}),
+        )
+        answers.append(await service.handle_message({"op": "solve", "map_id": map_id}))
+        return service, answers
+
+    service, answers = asyncio.run(scenario())
+
+    # THEN only one computation should have been run, the last answer should come from the cache
+    assert [answer["steps"] for answer in answers] == [31, 29, 31, 31]
+    metrics = service.get_metrics()
+    assert metrics["computations"] == 1
+    assert metrics["coalesced"] == 2
+    assert metrics["cache_hits"] == 1
+    assert metrics["queue_depth"] == 0
+    assert metrics["waiting"] == 0
+    assert metrics["requests"] == 5
+    assert 0 <= metrics["latency_p50"] <= metrics["latency_p95"] <= metrics["latency_max"]
+
+@pytest.mark.parametrize("message, error", [
+    ({"op": "solve", "map_id": "nothing"}, "Unknown map nothing!"),
+    ({"op": "fly"}, "Unknown operation fly!"),
+    ({"op": "map", "map": "ab\nc"}, "Invalid line length detected at line 1!"),
+])
+def test_invalid_messages_are_answered_with_an_error(message, error):
+    # GIVEN a service
+    service = SolveService()
+    # WHEN sending an invalid message
+    response = asyncio.run(service.handle_message(message))
+    # THEN the error should be answered and counted
+    assert response == {"error": error}
+    assert service.get_metrics()["errors"] == 1
+
+def test_unreachable_target_and_field_off_the_map():
+    # GIVEN a service with a map where the corner can not be reached from the middle
+    async def scenario():
+        service = SolveService()
+        map_id = (await service.handle_message({"op": "map", "map": "fbf\nbab\nfbf"}))["map_id"]
+        # WHEN asking for the corner and for a field off the map
+        unreachable = await service.handle_message(
+            {"op": "solve", "map_id": map_id, "start": [1, 1], "target": [0, 0], "path": True})
+        outside = await service.handle_message({"op": "solve", "map_id": map_id, "start": [1, 1], "target": [3, 0]})
+        missing = await service.handle_message({"op": "solve", "map_id": map_id})
+        return unreachable, outside, missing
+
+    unreachable, outside, missing = asyncio.run(scenario())
+
+    # THEN there should be no path and errors for the other requests
+    assert unreachable == {"steps": None, "path": None}
+    assert outside == {"error": "Field (3, 0) is not on the map!"}
+    assert missing == {"error": "Map needs a start and an end!"}
@@ -0,0 +1,104 @@
+import pytest
+from src.model import Map, Field, Walker, Path, ShortestPathFinder
+from src.tiled import TiledMap
+
+SMALL_TEST_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+def open_tiled_map(tmp_path, map_string, tile_size, cache_size):
+    # write map_string to a file and convert it into a TiledMap
+    map_file = tmp_path / "map.txt"
+    map_file.write_text(map_string)
+    return TiledMap.from_file(str(map_file), str(tmp_path / "map.tiles"), tile_size, cache_size)
+
+def test_tiled_map_contains_all_fields(tmp_path):
+    # GIVEN a map split into 3x3 tiles, which do not fit the map exactly
+    world = open_tiled_map(tmp_path, SMALL_TEST_MAP, tile_size=3, cache_size=2)
+    expected = Map.from_string(SMALL_TEST_MAP)
+    # THEN it should contain the same fields, start and end as the map from the string
+    assert (world.width, world.height) == (8, 5)
+    for y in range(expected.height):
+        for x in range(expected.width):
+            assert world.get_field(x, y) == expected.get_field(x, y)
+    assert world.start == expected.start
+    assert world.end == expected.end
+    assert world.get_neighbours(Field(0, 0, 0)) == expected.get_neighbours(Field(0, 0, 0))
+
+@pytest.mark.parametrize("engine", ["bfs", "astar", "bidirectional", "dfs"])
+def test_solving_a_tiled_map(tmp_path, engine):
+    # GIVEN a map in 12 tiles with a cache smaller than a row of tiles
+    world = open_tiled_map(tmp_path, SMALL_TEST_MAP, tile_size=2, cache_size=3)
+    walker = Walker(world)
+    page_ins = world.page_ins
+    # WHEN building the move masks and hashing the content
+    world.get_masks()
+    world.get_content_hash()
+    # THEN every tile should have been paged in at most once per pass over the map
+    assert world.page_ins - page_ins <= 2 * 12
+    # WHEN solving it
+    shortest = ShortestPathFinder.solve(world, Path(walker), walker, engine=engine)
+    # THEN the path length should be 31
+    assert shortest.get_length() == 32
+    assert shortest.get_end() == Field(5, 2, 25)
+    # AND tiles should have been served from the cache
+    assert 0 < world.get_hit_rate() < 1
+
+def test_tiled_map_has_the_elevations_of_the_map(tmp_path):
+    # GIVEN a tiled map and the same map parsed from the string
+    world = open_tiled_map(tmp_path, SMALL_TEST_MAP, tile_size=3, cache_size=1)
+    expected = Map.from_string(SMALL_TEST_MAP)
+    # WHEN reading all elevations tile by tile
+    # THEN they should be the same as the ones of the map
+    assert world.get_elevations() == expected.get_elevations()
+    assert world.get_elevation_grid().tolist() == expected.get_elevation_grid().tolist()
+    assert world.get_content_hash() == expected.get_content_hash()
+
+def test_tile_cache_counts_hits_and_page_ins(tmp_path):
+    # GIVEN a map in 2x2 tiles with room for one tile in the cache
+    open_tiled_map(tmp_path, SMALL_TEST_MAP, tile_size=2, cache_size=1).close()
+    world = TiledMap(str(tmp_path / "map.tiles"), 8, 5, tile_size=2, cache_size=1)
+    # WHEN reading two fields of the same tile and one of another tile
+    world.get_field(0, 0)
+    world.get_field(1, 1)
+    world.get_field(2, 0)
+    world.get_field(0, 1)
+    # THEN only the first access to a tile which is not cached should page in
+    assert world.page_ins == 3
+    assert world.hits == 1
+    assert world.get_hit_rate() == 0.25
+
+def test_changed_fields_are_written_back(tmp_path):
+    # GIVEN a tiled map with a cache of one tile
+    world = open_tiled_map(tmp_path, SMALL_TEST_MAP, tile_size=2, cache_size=1)
+    # WHEN changing a field and evicting its tile
+    world.add_field(1, 0, 7)
+    world.get_field(4, 4)
+    world.close()
+    # THEN the change should be in the tile file
+    reopened = TiledMap(str(tmp_path / "map.tiles"), 8, 5, tile_size=2, cache_size=1)
+    assert reopened.get_field(1, 0) == Field(1, 0, 7)
+    assert reopened.get_field(0, 0) == Field(0, 0, 0)
+    reopened.close()
+
+def test_tiled_map_is_closed_after_a_with_block(tmp_path):
+    # GIVEN a tiled map opened in a with block
+    open_tiled_map(tmp_path, SMALL_TEST_MAP, tile_size=2, cache_size=4).close()
+    with TiledMap(str(tmp_path / "map.tiles"), 8, 5, tile_size=2, cache_size=4) as world:
+        # WHEN changing a field that stays in the cache
+        world.add_field(1, 0, 7)
+    # THEN the tile file should be closed and the change written back
+    assert world.tile_file.closed
+    with TiledMap(str(tmp_path / "map.tiles"), 8, 5, tile_size=2, cache_size=4) as reopened:
+        assert reopened.get_field(1, 0) == Field(1, 0, 7)
+
+def test_invalid_tile_size(tmp_path):
+    # GIVEN a tile size of 0
+    # WHEN converting a map
+    # THEN an error should be raised
+    with pytest.raises(Exception) as excinfo:
+        open_tiled_map(tmp_path, SMALL_TEST_MAP, tile_size=0, cache_size=1)
+    assert str(excinfo.value) == "Tile size and cache size must be at least 1!"
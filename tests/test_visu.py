@@ -0,0 +1,95 @@
+import sys
+import subprocess
+import pytest
+import numpy as np
+from src.model import Map, Field, Walker, Path, ShortestPathFinder
+
+pytest.importorskip("matplotlib")
+from src.visu import render_path, get_annotated_steps, save_image, render_search
+from src.visu import UNREACHABLE_COLOR, EXPANDED_COLOR
+
+PATH = [Field(0, 0, 0), Field(1, 0, 1), Field(1, 1, 25)]
+
+def test_rendering_a_path_on_a_white_grid():
+    # GIVEN a path of three fields
+    # WHEN rendering it on a 2x3 grid
+    grid = render_path(PATH, 2, 3)
+    # THEN only the path fields should be coloured, low red and high green
+    assert grid.shape == (2, 3, 3)
+    assert (grid[0, 2] == 1).all() and (grid[1, 0] == 1).all() and (grid[1, 2] == 1).all()
+    assert grid[0, 0, 0] > grid[0, 0, 1]
+    assert grid[1, 1, 1] > grid[1, 1, 0]
+
+def test_rendering_a_path_over_the_elevations():
+    # GIVEN the elevations of a 2x3 map
+    elevations = np.array([[0, 1, 25], [0, 25, 3]])
+    # WHEN rendering the path over them
+    grid = render_path(PATH, 2, 3, elevations)
+    # THEN the other fields should be faded and the path fields in full colour
+    assert (grid[0, 2] >= 0.5).all()
+    assert grid[0, 2, 1] > grid[0, 2, 0]
+    assert grid[0, 0].min() < 0.5
+
+def test_annotations_of_long_paths_are_decimated():
+    # GIVEN paths of different lengths
+    # WHEN getting the steps to annotate
+    # THEN short paths should get all, long paths every n-th and the last step
+    assert list(get_annotated_steps(5, max_annotations=10)) == [0, 1, 2, 3, 4]
+    assert list(get_annotated_steps(25, max_annotations=10)) == [0, 3, 6, 9, 12, 15, 18, 21, 24]
+    assert len(get_annotated_steps(100000)) <= 51
+
+def test_plotting_into_a_png_file_without_pyplot(tmp_path):
+    # GIVEN a long path
+    script = ("import sys; from src.model import Field; from src.visu import plot_path; "
+              "plot_path([Field(x, y, (x + y) % 26) for y in range(200) for x in range(200)], 200, 200, sys.argv[1]); "
+              "print('matplotlib.pyplot' in sys.modules)")
+    # WHEN plotting it into a file in a fresh interpreter
+    output = subprocess.run([sys.executable, "-c", script, str(tmp_path / "path.png")],
+                            capture_output=True, text=True, check=True).stdout
+    # THEN a PNG should be written without loading pyplot
+    assert output.strip() == "False"
+    assert (tmp_path / "path.png").read_bytes().startswith(b"\x89PNG")
+
+def test_saving_one_pixel_per_field(tmp_path):
+    # GIVEN the image of a path
+    grid = render_path(PATH, 2, 3)
+    # WHEN saving it
+    save_image(str(tmp_path / "path.png"), grid)
+    # THEN the PNG should have the size of the map
+    import matplotlib.image
+    assert matplotlib.image.imread(str(tmp_path / "path.png")).shape[:2] == (2, 3)
+
+def test_rendering_distances_and_expanded_fields(tmp_path):
+    # GIVEN a map where the middle can not reach the corner, the distance field to the corner and
+    # the fields expanded by a solve
+    world = Map.from_string("fbf\nbab\nfbf")
+    world.set_start(1, 1)
+    world.set_end(1, 2)
+    expanded = []
+    walker = Walker(world)
+    ShortestPathFinder.solve(world, Path(walker), walker, on_expand=expanded.append)
+    distances = ShortestPathFinder.distance_field(world, Field(0, 0, 5))
+
+    # WHEN rendering both into a file
+    heatmap, coverage = render_search(world, distances, expanded, str(tmp_path / "search.png"))
+
+    # THEN the corner should differ from the unreachable middle, which should be gray
+    assert heatmap.shape == coverage.shape == (3, 3, 3)
+    assert tuple(heatmap[1, 1]) == UNREACHABLE_COLOR
+    assert tuple(heatmap[0, 0]) != UNREACHABLE_COLOR
+    # AND only the expanded fields should be marked
+    marked = {(x, y) for y in range(3) for x in range(3) if tuple(coverage[y, x]) == EXPANDED_COLOR}
+    assert marked == {(field.x, field.y) for field in expanded}
+    assert (tmp_path / "search.png").read_bytes().startswith(b"\x89PNG")
+
+def test_rendering_a_wavefront_distance_array_only():
+    # GIVEN the distance array of a wavefront search
+    from src.wavefront import search
+    world = Map.from_string("abc\nfed")
+    distances = search(world, Field(0, 0, 0), Field(0, 1, 5))[0]
+    # WHEN rendering only the distances
+    heatmap, coverage = render_search(world, distances)
+    # THEN there should be no coverage image and every field should be reachable
+    assert coverage is None
+    assert heatmap.shape == (2, 3, 3)
+    assert not (heatmap == UNREACHABLE_COLOR).all(axis=2).any()
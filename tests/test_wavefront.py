@@ -0,0 +1,91 @@
+import random
+import pytest
+from src.model import Map, Field, Walker, Path, ShortestPathFinder
+from src.wavefront import count_steps
+from tests.test_model import FULL_TEST_MAP
+
+SMALL_TEST_MAP = """\
+Sabqponm
+abcryxxl
+accszExk
+acctuvwj
+abdefghi"""
+
+def solve(world, engine):
+    # solve the map from its start with the given engine
+    walker = Walker(world)
+    return ShortestPathFinder.solve(world, Path(walker), walker, engine=engine)
+
+def test_counting_the_steps_of_the_small_test_map():
+    # GIVEN the small test map
+    world = Map.from_string(SMALL_TEST_MAP)
+    # WHEN counting the steps with the wavefront
+    # THEN it should be the 31 steps of the puzzle
+    assert count_steps(world) == 31
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_solving_the_full_test_map(compact):
+    # GIVEN the full test map
+    world = Map.from_string(FULL_TEST_MAP, compact=compact)
+    # WHEN solving it with the wavefront engine
+    shortest, stats = ShortestPathFinder.solve_with_stats(world, Path(Walker(world)), Walker(world), engine="wavefront")
+    # THEN it should find the same path length as the bfs
+    assert shortest.get_length() == 413
+    assert shortest.fields[0] == world.start
+    assert shortest.get_end() == Field(68, 20, 25)
+    assert stats.engine == "wavefront"
+    assert 0 < stats.expanded <= world.width * world.height
+
+def test_unreachable_end():
+    # GIVEN a map with a wall in front of the end
+    world = Map.from_string("Sbz\nabz\nzzE")
+    # WHEN solving it with the wavefront engine
+    # THEN no path should be found
+    assert solve(world, "wavefront") is None
+    assert count_steps(world) is None
+
+def test_move_masks_only_allow_climbing_one_up():
+    # GIVEN a row with the elevations a, b, d
+    north, south, west, east = Map.from_string("abd").get_masks()
+    # THEN a step east is only allowed from a to b, steps west always, no step leaves the map
+    assert east.tolist() == [[True, False, False]]
+    assert west.tolist() == [[False, True, True]]
+    assert not north.any() and not south.any()
+
+def test_wavefront_and_bfs_agree_on_random_maps():
+    # GIVEN random maps with random start and end
+    generator = random.Random(17)
+    for _ in range(200):
+        width = generator.randint(1, 10)
+        height = generator.randint(1, 10)
+        world = Map.from_string("\n".join(
+            "".join(generator.choice("abcde") for _ in range(width)) for _ in range(height)))
+        world.set_start(generator.randrange(width), generator.randrange(height))
+        world.set_end(generator.randrange(width), generator.randrange(height))
+        # WHEN solving them with both engines
+        expected = solve(world, "bfs")
+        shortest = solve(world, "wavefront")
+        # THEN the paths should be equally long and only contain legal steps
+        if expected is None:
+            assert shortest is None
+            continue
+        assert shortest.get_length() == expected.get_length()
+        assert shortest.fields[0] == world.start
+        assert shortest.get_end() == world.end
+        for field, next_field in zip(shortest.fields, shortest.fields[1:]):
+            assert next_field in world.get_neighbours(field)
+            assert Walker(field).can_climb(next_field)
+
+def test_expand_hook_gets_every_reached_field():
+    # GIVEN the small test map
+    world = Map.from_string(SMALL_TEST_MAP)
+    walker = Walker(world)
+    expanded = []
+    # WHEN solving it with the wavefront engine and an expand hook
+    shortest, stats = ShortestPathFinder.solve_with_stats(world, Path(walker), walker, engine="wavefront",
+                                                          on_expand=expanded.append)
+    # THEN every reached field should be passed once, starting at the start
+    assert shortest.get_length() == 32
+    assert expanded[0] == world.start
+    assert len(set(expanded)) == len(expanded) == stats.expanded
+    assert world.end in expanded